@@ -11,6 +11,15 @@ def _split_list(value: str):
     return [v.strip().lower() for v in value.split(",") if v.strip()]
 
 
+def _parse_feed_intervals(value: str):
+    intervals = {}
+    for line in value.splitlines():
+        url, sep, minutes = line.rpartition("=")
+        if sep and url.strip() and minutes.strip().isdigit() and int(minutes):
+            intervals[url.strip()] = int(minutes)
+    return intervals
+
+
 def _configure_user_workspace(user: str | None) -> None:
     storage_mode = (os.environ.get("APP_USER_STORAGE") or "").strip().lower()
     if storage_mode != "per_user" or not user:
@@ -20,6 +29,30 @@ def _configure_user_workspace(user: str | None) -> None:
     os.environ["JOB_FINDER_DATA_ROOT"] = str(user_root)
 
 
+def _fingerprint_or_error(client, body: str):
+    try:
+        return client.extract_fingerprint(body)
+    except ClaudeOutputError as exc:
+        st.error(str(exc))
+        return None
+
+
+@st.cache_resource
+def _get_async_client(key: str):
+    # One pooled client per key for the whole server process, shared across reruns.
+    return AsyncClaudeClient(key)
+
+
+def _report_claude_stats(claude_client, before: dict) -> None:
+    saved = claude_client.stats["tokens_saved"] - before.get("tokens_saved", 0)
+    parsed = claude_client.stats["parsed"] - before.get("parsed", 0)
+    failures = claude_client.stats["parse_failures"] - before.get("parse_failures", 0)
+    if saved:
+        st.caption(f"Boilerplate stripping saved ~{saved:,} input tokens")
+    if failures:
+        st.caption(f"Structured-output retries: {failures / (parsed + failures):.0%} of replies failed validation")
+
+
 st.set_page_config(page_title="Job Similarity Finder", layout="wide")
 current_user = require_login()
 _configure_user_workspace(current_user)
@@ -29,13 +62,14 @@ from job_finder.app_logic import (
     auto_import_applications_to_liked,
     bulk_generate_applications,
     create_application_folder,
+    export_jobs_to_markdown,
     ingest_folder,
     list_inbox_files,
     list_liked_files,
     load_base_resume,
     move_to_liked,
 )
-from job_finder.claude import ClaudeClient
+from job_finder.claude import AsyncClaudeClient, ClaudeClient, ClaudeOutputError
 from job_finder.config import (
     get_applications_dir,
     get_data_dir,
@@ -48,9 +82,11 @@ from job_finder.config import (
 )
 from job_finder.env import ensure_anthropic_key, ensure_resend_key, get_resend_from
 from job_finder.filtering import evaluate_filters, load_reputable_companies, save_reputable_companies
+from job_finder.local_fingerprint import is_local_fingerprint
+from job_finder.pipeline import run_pipeline
 from job_finder.profile import InterestProfile, load_profile, save_profile
 from job_finder.scoring import score_against_liked
-from job_finder.scraper import extract_search_terms, scrape_similar_jobs, save_jobs_to_inbox
+from job_finder.scraper import extract_search_terms, load_scrape_cursor, save_jobs_to_inbox, scrape_similar_jobs
 from job_finder.storage import list_jobs, upsert_job
 
 st.title("Job Application Assistant")
@@ -207,6 +243,7 @@ with st.sidebar:
     st.caption(f"Liked: {get_liked_dir()}")
 
 client = ClaudeClient(api_key) if api_key else None
+async_client = _get_async_client(api_key) if api_key else None
 profile = load_profile()
 
 
@@ -256,13 +293,79 @@ with tab_ingest:
         )
         st.caption(f"Search terms derived from your profile: **{' | '.join(terms_preview)}**")
 
-        col_loc, col_n = st.columns(2)
+        col_loc, col_n, col_time = st.columns(3)
         with col_loc:
             scrape_location = st.text_input("Location", value="United States")
         with col_n:
-            scrape_n = st.number_input("Results per search term", min_value=5, max_value=30, value=15, step=5)
+            scrape_n = st.number_input("Results per search term", min_value=5, max_value=100, value=25, step=5)
+        with col_time:
+            scrape_time_limit = st.number_input(
+                "Time limit (seconds, 0 = none)",
+                min_value=0,
+                max_value=1800,
+                value=0,
+                step=30,
+                help="Stops with the jobs found so far; the next search picks up where this one left off.",
+            )
+        scrape_deadline = float(scrape_time_limit) or None
+        if load_scrape_cursor():
+            st.caption("A previous search was cut short — the next run resumes it first.")
+
+        stream_pipeline = st.checkbox(
+            "Fingerprint and score jobs as they arrive",
+            value=True,
+            help="Saves, fingerprints and scores each job while the search is still running — no separate Ingest step.",
+        )
+        if not stream_pipeline:
+            st.caption(
+                "Without streaming, every derived search term is searched and no per-term yield is recorded, "
+                "so the request budget and term planning are skipped."
+            )
+        write_inbox_files = st.checkbox(
+            "Also write each job as a markdown file in jobs/inbox",
+            value=False,
+            disabled=not stream_pipeline,
+            help="Streamed jobs go straight into the database. Files can be exported later from Step 3b.",
+        )
 
-        if st.button("🔍 Find Similar Jobs on LinkedIn", type="primary"):
+        find_clicked = st.button("🔍 Find Similar Jobs on LinkedIn", type="primary")
+        if find_clicked and stream_pipeline:
+            pipeline_status = st.empty()
+            pipeline_matches = st.empty()
+            stats_before = dict(async_client.stats) if async_client else {}
+            final = None
+            for update in run_pipeline(
+                liked_fps_for_scrape,
+                client=async_client,
+                profile=profile,
+                location=scrape_location,
+                results_per_term=int(scrape_n),
+                write_markdown=write_inbox_files,
+                deadline=scrape_deadline,
+            ):
+                final = update
+                pipeline_status.text(
+                    f"{update.message}  •  scraped {update.scraped} → saved {update.saved} → "
+                    f"fingerprinted {update.fingerprinted} → scored {update.scored}"
+                )
+                if update.top:
+                    pipeline_matches.markdown(
+                        "\n".join(
+                            f"{i}. **{m.company}** — {m.role}  ·  score {m.score:.2f}  ·  [{m.source}]({m.url})"
+                            for i, m in enumerate(update.top, 1)
+                        )
+                    )
+            if final:
+                for err in final.errors:
+                    st.error(err)
+                if final.scored:
+                    pipeline_status.text(f"Done — {final.scored} new job(s) saved, fingerprinted and scored.")
+                    st.success("The full ranking is in the **Matches** tab.")
+                else:
+                    pipeline_status.text("No new jobs found — LinkedIn may be rate limiting. Try again in a minute.")
+            if async_client:
+                _report_claude_stats(async_client, stats_before)
+        elif find_clicked:
             scrape_status = st.empty()
             scrape_progress = st.progress(0)
 
@@ -279,6 +382,7 @@ with tab_ingest:
                     location=scrape_location,
                     results_per_term=int(scrape_n),
                     on_progress=_scrape_progress,
+                    deadline=scrape_deadline,
                 )
             except Exception as e:
                 scrape_errors.append(str(e))
@@ -307,13 +411,35 @@ with tab_ingest:
         "Then ingest them below."
     )
 
+    db_only_inbox = [j for j in list_jobs("inbox") if not j.path]
+    if db_only_inbox and st.button(f"Export {len(db_only_inbox)} database-only inbox job(s) to markdown"):
+        exported = export_jobs_to_markdown(db_only_inbox, get_inbox_dir())
+        st.success(f"Wrote {len(exported)} file(s) to {get_inbox_dir()}")
+
     run_fingerprint = st.checkbox("Run Claude fingerprint extraction", value=True)
+    st.caption("Without Claude, a local rule-based fingerprint is used (instant, upgradeable later).")
+    force_ingest = st.checkbox(
+        "Force re-ingest",
+        value=False,
+        help="Re-read every file, including unchanged ones and ones skipped as duplicates of another job.",
+    )
     if st.button("Ingest Inbox"):
         if run_fingerprint and not client:
-            st.error("Claude key missing")
-        else:
-            ingested = ingest_folder(INBOX_DIR, "inbox", client if run_fingerprint else None)
-            st.success(f"Ingested {len(ingested)} job(s)")
+            st.warning("Claude key missing — using local fingerprints")
+        ingest_client = async_client if run_fingerprint else None
+        stats_before = dict(ingest_client.stats) if ingest_client else {}
+        ingest_progress = st.progress(0.0)
+        ingested = ingest_folder(
+            INBOX_DIR,
+            "inbox",
+            ingest_client,
+            force=force_ingest,
+            on_progress=lambda done, total, path: ingest_progress.progress(done / total, text=f"{done}/{total} · {path.name}"),
+        )
+        ingest_progress.empty()
+        st.success(f"Ingested {len(ingested)} new or changed job(s)")
+        if ingest_client:
+            _report_claude_stats(ingest_client, stats_before)
 
     st.divider()
     st.subheader("Liked Jobs")
@@ -326,19 +452,40 @@ with tab_ingest:
 
     if st.button("Ingest Liked"):
         if run_fingerprint and not client:
-            st.error("Claude key missing")
-        else:
-            ingested = ingest_folder(LIKED_DIR, "liked", client if run_fingerprint else None)
-            st.success(f"Ingested {len(ingested)} liked job(s)")
+            st.warning("Claude key missing — using local fingerprints")
+        ingest_client = async_client if run_fingerprint else None
+        stats_before = dict(ingest_client.stats) if ingest_client else {}
+        ingest_progress = st.progress(0.0)
+        ingested = ingest_folder(
+            LIKED_DIR,
+            "liked",
+            ingest_client,
+            force=force_ingest,
+            on_progress=lambda done, total, path: ingest_progress.progress(done / total, text=f"{done}/{total} · {path.name}"),
+        )
+        ingest_progress.empty()
+        st.success(f"Ingested {len(ingested)} new or changed liked job(s)")
+        if ingest_client:
+            _report_claude_stats(ingest_client, stats_before)
 
     st.subheader("Job Alerts")
-    st.caption("Runs RSS/feeds configured in Profile and drops new items into inbox")
+    st.caption("Runs RSS/feeds configured in Profile, drops new items into inbox and scores them")
     if st.button("Run Alerts Now"):
         current_profile = load_profile()
-        new_files = run_alerts(current_profile)
-        st.success(f"Added {len(new_files)} new job(s) to inbox")
-        if current_profile.alert_email_enabled and current_profile.alert_email_to and resend_key and new_files:
-            html = build_alert_email(new_files)
+        stats_before = dict(async_client.stats) if async_client else {}
+        alert_result = run_alerts(current_profile, client=async_client)
+        alert_matches = alert_result.matches
+        st.success(f"Added {len(alert_matches)} new job(s) to inbox — already fingerprinted and scored")
+        for feed_url, feed_error in alert_result.failures.items():
+            st.warning(f"Feed failed: {feed_url} — {feed_error}")
+        if alert_result.fingerprint_error:
+            st.warning(f"Claude fingerprinting failed, used local fingerprints — {alert_result.fingerprint_error}")
+        for m in alert_matches[:10]:
+            st.write(f"• {m.score:.2f} — {m.title}")
+        if async_client:
+            _report_claude_stats(async_client, stats_before)
+        if current_profile.alert_email_enabled and current_profile.alert_email_to and resend_key and alert_matches:
+            html = build_alert_email(alert_matches)
             send_resend_email(
                 resend_key,
                 current_profile.alert_email_to,
@@ -357,31 +504,34 @@ with tab_liked:
         for job in liked_jobs:
             st.markdown(f"**{job.company or 'Unknown'} — {job.role or job.job_id}**")
             st.caption(job.path)
-            if job.fingerprint_json:
+            if job.fingerprint_json and not is_local_fingerprint(json.loads(job.fingerprint_json)):
                 st.caption("Fingerprint ready")
             else:
+                if job.fingerprint_json:
+                    st.caption("Local fingerprint — upgrade with Claude for better matches")
                 if st.button(f"Create fingerprint for {job.job_id}"):
                     if not client:
                         st.error("Claude key missing")
                     else:
-                        fingerprint = client.extract_fingerprint(job.body)
-                        upsert_job({
-                            "job_id": job.job_id,
-                            "path": job.path,
-                            "bucket": job.bucket,
-                            "liked": job.liked,
-                            "company": job.company,
-                            "role": job.role,
-                            "location": job.location,
-                            "level": job.level,
-                            "domain": job.domain,
-                            "skills": job.skills,
-                            "source": job.source,
-                            "date_saved": job.date_saved,
-                            "body": job.body,
-                            "fingerprint": fingerprint,
-                        })
-                        st.success("Fingerprint added")
+                        fingerprint = _fingerprint_or_error(client, job.body)
+                        if fingerprint:
+                            upsert_job({
+                                "job_id": job.job_id,
+                                "path": job.path,
+                                "bucket": job.bucket,
+                                "liked": job.liked,
+                                "company": job.company,
+                                "role": job.role,
+                                "location": job.location,
+                                "level": job.level,
+                                "domain": job.domain,
+                                "skills": job.skills,
+                                "source": job.source,
+                                "date_saved": job.date_saved,
+                                "body": job.body,
+                                "fingerprint": fingerprint,
+                            })
+                            st.success("Fingerprint added")
             st.divider()
 
 with tab_matches:
@@ -450,32 +600,36 @@ with tab_matches:
                         if not base_resume:
                             st.error("Missing templates/base-resume.md")
                         else:
-                            resume_md, cover_md = client.generate_tailored_docs(base_resume, job.body)
-                            dest = create_application_folder(job, resume_md, cover_md)
-                            st.success(f"Created application folder: {dest}")
+                            try:
+                                resume_md, cover_md = client.generate_tailored_docs(base_resume, job.body)
+                                dest = create_application_folder(job, resume_md, cover_md)
+                                st.success(f"Created application folder: {dest}")
+                            except ClaudeOutputError as exc:
+                                st.error(str(exc))
             with col3:
                 if st.button(f"Fingerprint: {job.job_id}"):
                     if not client:
                         st.error("Claude key missing")
                     else:
-                        fingerprint = client.extract_fingerprint(job.body)
-                        upsert_job({
-                            "job_id": job.job_id,
-                            "path": job.path,
-                            "bucket": job.bucket,
-                            "liked": job.liked,
-                            "company": job.company,
-                            "role": job.role,
-                            "location": job.location,
-                            "level": job.level,
-                            "domain": job.domain,
-                            "skills": job.skills,
-                            "source": job.source,
-                            "date_saved": job.date_saved,
-                            "body": job.body,
-                            "fingerprint": fingerprint,
-                        })
-                        st.success("Fingerprint updated")
+                        fingerprint = _fingerprint_or_error(client, job.body)
+                        if fingerprint:
+                            upsert_job({
+                                "job_id": job.job_id,
+                                "path": job.path,
+                                "bucket": job.bucket,
+                                "liked": job.liked,
+                                "company": job.company,
+                                "role": job.role,
+                                "location": job.location,
+                                "level": job.level,
+                                "domain": job.domain,
+                                "skills": job.skills,
+                                "source": job.source,
+                                "date_saved": job.date_saved,
+                                "body": job.body,
+                                "fingerprint": fingerprint,
+                            })
+                            st.success("Fingerprint updated")
             st.divider()
 
 with tab_bulk:
@@ -561,7 +715,7 @@ with tab_bulk:
                             seed_job=seed_job,
                             inbox_jobs=inbox_with_fp,
                             base_resume=base_resume,
-                            client=client,
+                            client=async_client,
                             top_n=int(top_n),
                             on_progress=_on_progress,
                         )
@@ -628,6 +782,13 @@ with tab_profile:
 
     st.subheader("Job Alert Sources")
     alert_sources = st.text_area("RSS or feed URLs (one per line)", "\n".join(profile.alert_sources))
+    alert_interval = st.number_input(
+        "Alert daemon poll interval (minutes)", min_value=1, value=int(profile.alert_interval_minutes or 60), step=5
+    )
+    alert_feed_intervals = st.text_area(
+        "Per-feed intervals (optional, one `URL = minutes` per line)",
+        "\n".join(f"{url} = {minutes}" for url, minutes in profile.alert_feed_intervals.items()),
+    )
 
     st.subheader("Alert Email")
     alert_email_to = st.text_input("Send alerts to", profile.alert_email_to or "")
@@ -646,6 +807,8 @@ with tab_profile:
             alert_sources=[line.strip() for line in alert_sources.splitlines() if line.strip()],
             alert_email_to=alert_email_to.strip() or None,
             alert_email_enabled=alert_email_enabled,
+            alert_interval_minutes=int(alert_interval),
+            alert_feed_intervals=_parse_feed_intervals(alert_feed_intervals),
         )
         save_profile(updated)
         save_reputable_companies([line.strip().lower() for line in allowlist_text.splitlines() if line.strip()])
@@ -0,0 +1,158 @@
+"""
+Long-running alert poller.
+
+Keeps one warm process instead of a scheduled task per run. Every feed has its
+own interval (profile.alert_feed_intervals, else profile.alert_interval_minutes),
+jittered so feeds drift apart, and backs off exponentially while it keeps
+failing. New alerts (already ingested and scored by run_alerts) are collected
+and handed to `notify` in one batch per email window instead of one email
+per poll.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .alerts import AlertMatch, run_alerts
+from .claude import AnyClaudeClient
+from .profile import InterestProfile, load_profile
+
+# Fraction of the interval each wait is randomly stretched or shrunk by.
+JITTER = 0.1
+MIN_INTERVAL = 60.0
+MAX_BACKOFF = 6 * 3600.0
+DEFAULT_EMAIL_WINDOW = 15 * 60.0
+# How often the profile is re-read to pick up added, removed or re-timed feeds.
+PROFILE_RELOAD = 60.0
+
+
+@dataclass
+class FeedSchedule:
+    url: str
+    interval: float
+    next_run: float = 0.0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class _PendingBatch:
+    matches: List[AlertMatch] = field(default_factory=list)
+    since: Optional[float] = None
+
+
+def feed_interval(profile: InterestProfile, url: str) -> float:
+    minutes = profile.alert_feed_intervals.get(url) or profile.alert_interval_minutes or 60
+    return max(float(minutes) * 60.0, MIN_INTERVAL)
+
+
+def next_delay(interval: float, failures: int, rng: Optional[random.Random] = None) -> float:
+    """Seconds until a feed's next poll: its interval, doubled per consecutive failure, jittered."""
+    base = min(interval * (2 ** failures), max(MAX_BACKOFF, interval)) if failures else interval
+    return base * (rng or random).uniform(1 - JITTER, 1 + JITTER)
+
+
+class AlertDaemon:
+    def __init__(
+        self,
+        notify: Optional[Callable[[List[AlertMatch]], None]] = None,
+        email_window: float = DEFAULT_EMAIL_WINDOW,
+        profile_loader: Callable[[], InterestProfile] = load_profile,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+        log: Callable[[str], None] = print,
+        client: Optional[AnyClaudeClient] = None,
+    ):
+        self.notify = notify
+        self.client = client
+        self.email_window = email_window
+        self.profile_loader = profile_loader
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.log = log
+        self.stop_event = threading.Event()
+        self.schedules: Dict[str, FeedSchedule] = {}
+        self.profile = InterestProfile()
+        self._pending = _PendingBatch()
+        self._reloaded_at: Optional[float] = None
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def reload_profile(self) -> None:
+        """Sync schedules with the profile; new feeds are spread over their first interval."""
+        now = self.clock()
+        self.profile = self.profile_loader()
+        self._reloaded_at = now
+        wanted = list(dict.fromkeys(self.profile.alert_sources))
+        for url in list(self.schedules):
+            if url not in wanted:
+                del self.schedules[url]
+        for url in wanted:
+            interval = feed_interval(self.profile, url)
+            schedule = self.schedules.get(url)
+            if schedule is None:
+                self.schedules[url] = FeedSchedule(url, interval, next_run=now + self.rng.uniform(0, JITTER * interval))
+            elif schedule.interval != interval:
+                schedule.interval = interval
+                schedule.next_run = min(schedule.next_run, now + next_delay(interval, schedule.failures, self.rng))
+
+    def tick(self) -> float:
+        """Poll every feed that is due and flush the email batch if its window closed; returns seconds to sleep."""
+        now = self.clock()
+        if self._reloaded_at is None or now - self._reloaded_at >= PROFILE_RELOAD:
+            self.reload_profile()
+
+        due = [s.url for s in self.schedules.values() if s.next_run <= now]
+        if due:
+            result = run_alerts(self.profile, urls=due, client=self.client)
+            now = self.clock()
+            for url in due:
+                schedule = self.schedules[url]
+                error = result.failures.get(url)
+                schedule.failures = schedule.failures + 1 if error else 0
+                schedule.last_error = error
+                schedule.next_run = now + next_delay(schedule.interval, schedule.failures, self.rng)
+                if error:
+                    self.log(f"feed failed ({schedule.failures}x, retry in {schedule.next_run - now:.0f}s): {url}: {error}")
+            if result.fingerprint_error:
+                self.log(f"Claude fingerprinting failed, used local fingerprints: {result.fingerprint_error}")
+            if result.matches:
+                self.log(f"{len(result.matches)} new alert(s) from {len(due)} feed(s)")
+                if self._pending.since is None:
+                    self._pending.since = now
+                self._pending.matches.extend(result.matches)
+
+        if self._pending.since is not None and now - self._pending.since >= self.email_window:
+            self.flush()
+
+        wake = [s.next_run for s in self.schedules.values()]
+        wake.append((self._reloaded_at or now) + PROFILE_RELOAD)
+        if self._pending.since is not None:
+            wake.append(self._pending.since + self.email_window)
+        return max(min(wake) - now, 0.0)
+
+    def flush(self) -> None:
+        """Hand the pending batch of matches to notify (one email), if there is one."""
+        matches, self._pending = self._pending.matches, _PendingBatch()
+        if matches and self.notify:
+            try:
+                self.notify(matches)
+            except Exception as exc:
+                self.log(f"alert notification failed: {exc}")
+
+    def run_forever(self) -> None:
+        """Poll until stop() is called; a pending batch is sent before returning."""
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    wait = self.tick()
+                except Exception as exc:
+                    self.log(f"alert poll failed: {exc}")
+                    wait = MIN_INTERVAL
+                self.stop_event.wait(wait)
+        finally:
+            self.flush()
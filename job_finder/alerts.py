@@ -1,23 +1,76 @@
 from __future__ import annotations
 
+import html
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import feedparser
 import requests
 
+from .claude import AnyClaudeClient, claude_call_errors, claude_fingerprints
 from .config import get_data_dir, get_inbox_dir
+from .identity import claim_jobs
+from .local_fingerprint import extract_local_fingerprint
+from .parser import render_front_matter, slugify
 from .profile import InterestProfile
+from .scoring import score_against_liked
+from .storage import evict_alert_seen, list_jobs, record_alert_seen, seen_alert_ids, upsert_jobs
 
 STATE_PATH = get_data_dir() / "alerts_state.json"
+DEFAULT_FEED_WORKERS = 8
+# Seen entries that no feed has listed for this long are forgotten.
+SEEN_TTL_DAYS = 180
+# (connect, read) seconds per socket operation of a feed request.
+FEED_TIMEOUT = (10, 30)
+# Wall-clock seconds a whole feed download may take, so one feed that trickles
+# its body (each read within FEED_TIMEOUT) still can't hold up a run.
+FEED_DEADLINE = 30.0
+FEED_CHUNK = 64 * 1024
+# Matches listed in a digest email; the rest are summarised as a count.
+DIGEST_LIMIT = 25
+
+
+@dataclass
+class AlertMatch:
+    score: float
+    job_id: str
+    title: str
+    link: str
+    feed: str
+    path: Path
+
+
+@dataclass
+class AlertRunResult:
+    new_files: List[Path] = field(default_factory=list)
+    # New entries after ingest and scoring, best match first.
+    matches: List[AlertMatch] = field(default_factory=list)
+    # Feed URL -> error for feeds that could not be fetched or parsed this run.
+    failures: Dict[str, str] = field(default_factory=dict)
+    # Why Claude fingerprinting failed this run; the local extractor was used instead.
+    fingerprint_error: Optional[str] = None
 
 
 def load_state() -> Dict:
+    """
+    Per-feed validators and last poll result, under "feeds".
+
+    Seen entry IDs live in the alert_seen table of jobs.db; a "seen" list
+    left by older versions is moved there the first time the state is loaded.
+    """
     if not STATE_PATH.exists():
-        return {"seen": []}
-    return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+        return {"feeds": {}}
+    state = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    state.setdefault("feeds", {})
+    if "seen" in state:
+        record_alert_seen((entry_id, None) for entry_id in state.pop("seen"))
+        save_state(state)
+    return state
 
 
 def save_state(state: Dict) -> None:
@@ -25,59 +78,234 @@ def save_state(state: Dict) -> None:
     STATE_PATH.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
-def run_alerts(profile: InterestProfile) -> List[Path]:
-    sources = profile.alert_sources
-    if not sources:
+def _read_body(resp: requests.Response, started: float, deadline: float) -> bytes:
+    """Stream the body, giving up once `deadline` seconds have passed since `started`."""
+    # read1 returns whatever has arrived instead of waiting for a full chunk (urllib3 >= 2.3).
+    read = getattr(resp.raw, "read1", None) or resp.raw.read
+    chunks = []
+    while True:
+        chunk = read(FEED_CHUNK, decode_content=True)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+        if time.perf_counter() - started > deadline:
+            raise TimeoutError(f"feed download took longer than {deadline:g}s")
+
+
+def _poll_feed(
+    url: str,
+    feed_state: Dict,
+    timeout: Tuple[float, float] = FEED_TIMEOUT,
+    deadline: float = FEED_DEADLINE,
+) -> Tuple[List, Dict]:
+    """
+    Conditional GET of one feed using the ETag / Last-Modified it sent last time.
+
+    Returns (entries, new_feed_state); entries is empty when the feed answered
+    304 Not Modified, in which case nothing was parsed. Raises on network
+    errors, timeouts (per socket read, and `deadline` for the whole
+    download), HTTP errors and unreadable feeds.
+    """
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if feed_state.get("etag"):
+        headers["If-None-Match"] = feed_state["etag"]
+    if feed_state.get("modified"):
+        headers["If-Modified-Since"] = feed_state["modified"]
+
+    started = time.perf_counter()
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        content = _read_body(resp, started, deadline) if resp.status_code != 304 else b""
+    updated = {
+        "etag": resp.headers.get("ETag") or feed_state.get("etag"),
+        "modified": resp.headers.get("Last-Modified") or feed_state.get("modified"),
+        "status": resp.status_code,
+        "checked_at": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+    if resp.status_code == 304:
+        updated.update(elapsed=round(time.perf_counter() - started, 3), entries=0)
+        return [], updated
+
+    feed = feedparser.parse(content, response_headers={k.lower(): v for k, v in resp.headers.items()})
+    if feed.get("bozo") and not feed.entries:
+        raise ValueError(f"unreadable feed: {feed.get('bozo_exception') or 'no entries'}")
+    updated.update(elapsed=round(time.perf_counter() - started, 3), entries=len(feed.entries))
+    return feed.entries, updated
+
+
+def _liked_fingerprints() -> List[Dict]:
+    return [json.loads(job.fingerprint_json) for job in list_jobs("liked") if job.fingerprint_json]
+
+
+def ingest_alert_jobs(
+    jobs: List[Dict],
+    feeds: Dict[str, str],
+    profile: Optional[InterestProfile] = None,
+    client: Optional[AnyClaudeClient] = None,
+    errors: Optional[List[str]] = None,
+) -> List[AlertMatch]:
+    """
+    Fingerprint and score new alert jobs, store them in one transaction, and
+    return them best match first.
+
+    jobs are inbox job dicts (job_id, path, role, source, body, …); feeds maps
+    job_id to the feed it came from. Fingerprints come from Claude when a
+    client is given (concurrently for an async client), falling back to the
+    local extractor for anything Claude skipped or when the call fails; the
+    failure is appended to `errors` when given. Other exceptions propagate.
+    """
+    if not jobs:
         return []
+    fingerprints: Dict[str, Dict] = {}
+    if client:
+        try:
+            fingerprints = claude_fingerprints(client, {job["job_id"]: job["body"] for job in jobs})
+        except claude_call_errors(client) as exc:
+            fingerprints = {}
+            if errors is not None:
+                errors.append(f"{type(exc).__name__}: {exc}")
+    for job in jobs:
+        job["fingerprint"] = fingerprints.get(job["job_id"]) or extract_local_fingerprint(
+            job["body"], title=str(job.get("role") or "")
+        )
+    upsert_jobs(jobs)
+
+    liked_fps = _liked_fingerprints()
+    matches = [
+        AlertMatch(
+            score=score_against_liked(job["fingerprint"], liked_fps, profile),
+            job_id=job["job_id"],
+            title=job.get("role") or job["job_id"],
+            link=job.get("source") or "",
+            feed=feeds.get(job["job_id"], ""),
+            path=Path(job["path"]),
+        )
+        for job in jobs
+    ]
+    matches.sort(key=lambda m: m.score, reverse=True)
+    return matches
+
+
+def run_alerts(
+    profile: InterestProfile,
+    workers: int = DEFAULT_FEED_WORKERS,
+    urls: Optional[List[str]] = None,
+    client: Optional[AnyClaudeClient] = None,
+) -> AlertRunResult:
+    """
+    Poll the profile's alert feeds (or just `urls`), write unseen entries to
+    the inbox, and ingest, fingerprint and score them (see ingest_alert_jobs).
+
+    Feeds are fetched concurrently by up to `workers` threads, each download
+    bounded by FEED_TIMEOUT per read and FEED_DEADLINE overall. Entries from
+    feeds that succeed are saved even when others fail; the failures come back
+    in the result, along with any Claude error that sent fingerprinting to the
+    local extractor.
+    """
+    result = AlertRunResult()
+    sources = list(dict.fromkeys(profile.alert_sources if urls is None else urls))
+    if not sources:
+        return result
 
     state = load_state()
-    seen = set(state.get("seen", []))
-    new_files = []
+    feeds = state.get("feeds", {})
+    inbox = get_inbox_dir()
+    inbox.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources))), thread_name_prefix="alerts") as pool:
+        polls = {url: pool.submit(_poll_feed, url, feeds.get(url, {})) for url in sources}
 
-    for url in sources:
-        feed = feedparser.parse(url)
-        for entry in feed.entries:
+    listed: List[Tuple[str, str, Dict]] = []
+    for url, poll in polls.items():
+        try:
+            entries, feeds[url] = poll.result()
+        except Exception as exc:
+            result.failures[url] = str(exc)
+            feeds[url] = {
+                **feeds.get(url, {}),
+                "status": getattr(getattr(exc, "response", None), "status_code", None),
+                "error": str(exc),
+                "checked_at": datetime.utcnow().isoformat(timespec="seconds"),
+            }
+            continue
+        for entry in entries:
             entry_id = entry.get("id") or entry.get("link") or entry.get("title")
-            if not entry_id or entry_id in seen:
-                continue
+            if entry_id:
+                listed.append((entry_id, url, entry))
+
+    # One batched lookup for everything the feeds returned, not a scan of the whole history.
+    seen = seen_alert_ids(entry_id for entry_id, _, _ in listed)
+    candidates: List[Tuple[str, str, Dict]] = []
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    for entry_id, url, entry in listed:
+        if entry_id in seen:
+            continue
+        seen.add(entry_id)
+        # Same ID ingest_folder would give the inbox file, so a later manual ingest updates this row.
+        job_id = slugify(_safe_name(entry_id))
+        candidates.append((job_id, url, {
+            "job_id": job_id,
+            "path": str(inbox / (_safe_name(entry_id) + ".md")),
+            "bucket": "inbox",
+            "liked": 0,
+            "role": entry.get("title", "New Job"),
+            "source": entry.get("link", ""),
+            "date_saved": today,
+            "body": entry.get("summary", "").strip(),
+        }))
 
-            title = entry.get("title", "New Job")
-            link = entry.get("link", "")
-            summary = entry.get("summary", "")
+    # Postings already stored from another source (or another feed) are linked, not re-ingested.
+    duplicates = claim_jobs([(job_id, job) for job_id, _, job in candidates], source="alerts")
+    new_jobs: List[Dict] = []
+    job_feeds: Dict[str, str] = {}
+    for job_id, url, job in candidates:
+        if job_id in duplicates:
+            continue
+        path = Path(job["path"])
+        path.write_text(_render_job_md(job["role"], job["source"], job["body"]), encoding="utf-8")
+        result.new_files.append(path)
+        job_feeds[job_id] = url
+        new_jobs.append(job)
 
-            file_name = _safe_name(entry_id) + ".md"
-            path = get_inbox_dir() / file_name
-            content = _render_job_md(title, link, summary)
-            path.write_text(content, encoding="utf-8")
+    fingerprint_errors: List[str] = []
+    result.matches = ingest_alert_jobs(new_jobs, job_feeds, profile=profile, client=client, errors=fingerprint_errors)
+    result.fingerprint_error = fingerprint_errors[0] if fingerprint_errors else None
 
-            seen.add(entry_id)
-            new_files.append(path)
+    # Refreshes last_seen too, so entries a feed still lists are never evicted.
+    record_alert_seen((entry_id, url) for entry_id, url, _ in listed)
+    evict_alert_seen(SEEN_TTL_DAYS)
 
-    save_state({"seen": sorted(seen)})
-    return new_files
+    # Feeds dropped from the profile don't need their validators any more.
+    feeds = {url: feeds[url] for url in dict.fromkeys(profile.alert_sources + sources) if url in feeds}
+    save_state({"feeds": feeds})
+    return result
 
 
-def build_alert_email(new_files: List[Path]) -> str:
-    items = "".join(
-        [f"<li>{path.name}</li>" for path in new_files]
+def build_alert_email(matches: List[AlertMatch], limit: int = DIGEST_LIMIT) -> str:
+    """Digest of new alert jobs ranked by match score against the liked jobs."""
+    ranked = sorted(matches, key=lambda m: m.score, reverse=True)
+    rows = "".join(
+        "<tr>"
+        f"<td>{m.score:.2f}</td>"
+        f"<td><a href=\"{html.escape(m.link, quote=True)}\">{html.escape(m.title)}</a></td>"
+        "</tr>"
+        if m.link
+        else f"<tr><td>{m.score:.2f}</td><td>{html.escape(m.title)}</td></tr>"
+        for m in ranked[:limit]
     )
+    more = len(ranked) - limit
     return (
-        "<p>New job alerts added to your inbox:</p>"
-        f"<ul>{items}</ul>"
-        "<p>Open the Job Similarity Finder to ingest and score them.</p>"
+        f"<p>{len(ranked)} new job alert(s), best matches first:</p>"
+        f"<table><tr><th>Score</th><th>Job</th></tr>{rows}</table>"
+        + (f"<p>…and {more} more.</p>" if more > 0 else "")
+        + "<p>They are already scored in the Job Similarity Finder's Matches tab.</p>"
     )
 
 
 def _render_job_md(title: str, link: str, summary: str) -> str:
     today = datetime.utcnow().strftime("%Y-%m-%d")
-    return (
-        "---\n"
-        f"role: {title}\n"
-        f"source: {link}\n"
-        f"date_saved: {today}\n"
-        "---\n\n"
-        f"{summary}\n"
-    )
+    return render_front_matter({"role": title, "source": link, "date_saved": today}, summary)
 
 
 def _safe_name(value: str) -> str:
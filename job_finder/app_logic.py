@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import multiprocessing
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from .claude import ClaudeClient
+from .claude import AnyClaudeClient, AsyncClaudeClient, claude_fingerprints
 from .config import (
     get_applications_dir,
     get_base_resume_path,
@@ -15,9 +21,20 @@ from .config import (
     get_liked_dir,
     get_user_base_resume_path,
 )
-from .parser import read_job_file, slugify
+from .identity import claim_jobs, index_jobs
+from .local_fingerprint import extract_local_fingerprint, is_local_fingerprint
+from .parser import normalize_job_id, parse_front_matter, render_front_matter, slugify
+from .preprocess import learn_boilerplate
 from .scoring import rank_by_seed
-from .storage import JobRecord, list_jobs, upsert_job
+from .storage import (
+    JobRecord,
+    get_jobs,
+    list_job_keys,
+    load_ingest_manifest,
+    record_ingest_manifest,
+    upsert_job,
+    upsert_jobs,
+)
 
 
 def _extract_meta(meta: Dict) -> Dict:
@@ -33,15 +50,157 @@ def _extract_meta(meta: Dict) -> Dict:
     }
 
 
-def ingest_folder(folder: Path, bucket: str, client: Optional[ClaudeClient] = None) -> List[JobRecord]:
-    ingested = []
-    for path in folder.glob("*.md"):
-        job_id, meta, body = read_job_file(path)
-        fingerprint = None
-        if client:
-            fingerprint = client.extract_fingerprint(body)
+# Most files per parse task and per upsert batch.
+INGEST_CHUNK = 200
+# Below this many files to read, a process pool costs more to start than it saves.
+PARALLEL_PARSE_MIN = 400
+# On a pool, aim for this many chunks per worker so they stay busy to the end,
+# but no fewer files per chunk than PARALLEL_CHUNK_MIN.
+CHUNKS_PER_WORKER = 4
+PARALLEL_CHUNK_MIN = 25
+
+
+def _file_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _fingerprint_kind(fingerprint: Optional[Dict[str, Any]]) -> str:
+    if not fingerprint:
+        return ""
+    return "local" if is_local_fingerprint(fingerprint) else "claude"
+
+
+def _read_job_files(items: List[Tuple[str, Optional[str]]]) -> List[Tuple]:
+    """
+    Read, hash and parse (path, settled_content_hash) items; runs in parse workers.
+
+    Returns ("touch", manifest_row) for files whose content still matches the
+    settled hash and ("parsed", path, job_id, meta, body, manifest_row) otherwise.
+    """
+    out: List[Tuple] = []
+    for path_str, settled_hash in items:
+        path = Path(path_str)
+        stat = path.stat()
+        data = path.read_bytes()
+        row = {"path": path_str, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "content_hash": _file_hash(data)}
+        if settled_hash and row["content_hash"] == settled_hash:
+            out.append(("touch", row))
+            continue
+        # Same newline handling as Path.read_text, so bodies compare equal to earlier ingests.
+        job = parse_front_matter(data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n"))
+        job_id = normalize_job_id(job.meta, path)
+        row.update(body_hash=_file_hash(job.body.encode("utf-8")), job_id=job_id)
+        out.append(("parsed", path, job_id, job.meta, job.body, row))
+    return out
 
-        job = {
+
+def _iter_parsed_chunks(items: List[Tuple[str, Optional[str]]], workers: Optional[int]) -> Iterator[List[Tuple]]:
+    """
+    _read_job_files over chunks of items, on a process pool when there are
+    enough files. Errors reading a file propagate; only a pool that can't
+    start or dies falls back to reading in this process.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(items) < PARALLEL_PARSE_MIN:
+        for i in range(0, len(items), INGEST_CHUNK):
+            yield _read_job_files(items[i:i + INGEST_CHUNK])
+        return
+    size = min(INGEST_CHUNK, max(PARALLEL_CHUNK_MIN, math.ceil(len(items) / (workers * CHUNKS_PER_WORKER))))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    try:
+        # Spawn, not fork: forking the threaded Streamlit server can copy a lock mid-use and deadlock.
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"))
+        # Workers are spawned on submit, so that is where a sandboxed host fails.
+        futures = [pool.submit(_read_job_files, chunk) for chunk in chunks]
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # No usable worker processes here (sandboxed or frozen host): read in-process.
+        for chunk in chunks:
+            yield _read_job_files(chunk)
+        return
+    done = 0
+    with pool:
+        try:
+            # In submission order, so progress and upserts stay in file order.
+            for future in futures:
+                results = future.result()
+                done += 1
+                yield results
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory): finish the rest in-process.
+            pass
+        finally:
+            for future in futures[done:]:
+                future.cancel()
+    for chunk in chunks[done:]:
+        yield _read_job_files(chunk)
+
+
+def _store_parsed(
+    results: List[Tuple],
+    bucket: str,
+    manifest: Dict[str, Dict[str, Any]],
+    client: Optional[AnyClaudeClient],
+    local_fallback: bool,
+    on_done: Callable[[List[str]], None],
+) -> List[JobRecord]:
+    """
+    Dedupe, fingerprint and upsert one chunk of _read_job_files results in one
+    transaction. on_done gets the paths that need no Claude call before it is
+    made, and the rest after.
+    """
+    manifest_rows: List[Dict[str, Any]] = [
+        {**manifest[row["path"]], **row} for kind, row in (r for r in results if r[0] == "touch")
+    ]
+    parsed = [
+        (path, job_id, meta, body, {**row, "bucket": bucket})
+        for _, path, job_id, meta, body, row in (r for r in results if r[0] == "parsed")
+    ]
+
+    if bucket == "inbox":
+        # The same posting saved under another name or fetched from another source: link it, don't re-ingest.
+        duplicates = claim_jobs([(job_id, meta) for _, job_id, meta, _, _ in parsed], source="ingest")
+        manifest_rows += [
+            {**row, "job_id": duplicates[job_id], "fingerprint_source": "duplicate"}
+            for _, job_id, _, _, row in parsed
+            if job_id in duplicates
+        ]
+        parsed = [item for item in parsed if item[1] not in duplicates]
+    else:
+        index_jobs((job_id, meta) for _, job_id, meta, _, _ in parsed)
+
+    # A job whose body is unchanged keeps its stored fingerprint (unless it's a local one Claude can upgrade),
+    # including when a front-matter edit changed its job_id.
+    previous = {
+        job_id: manifest[row["path"]]
+        for _, job_id, _, _, row in parsed
+        if row["path"] in manifest and manifest[row["path"]]["body_hash"] == row["body_hash"]
+    }
+    existing = get_jobs([job_id for _, job_id, _, _, _ in parsed] + [e["job_id"] for e in previous.values()])
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    for _, job_id, _, body, _ in parsed:
+        for record in (existing.get(job_id), existing.get((previous.get(job_id) or {}).get("job_id"))):
+            stored = json.loads(record.fingerprint_json) if record and record.fingerprint_json else None
+            if record and record.body == body and stored and (not client or not is_local_fingerprint(stored)):
+                fingerprints[job_id] = stored
+                break
+    to_fingerprint = {job_id: body for _, job_id, _, body, _ in parsed if job_id not in fingerprints}
+    on_done(
+        [row["path"] for row in manifest_rows]
+        + [str(path) for path, job_id, _, _, _ in parsed if job_id not in to_fingerprint]
+    )
+
+    # Learn repeated paragraphs first so boilerplate is stripped before any API call.
+    learn_boilerplate(to_fingerprint.values())
+    if client and to_fingerprint:
+        fingerprints.update(claude_fingerprints(client, to_fingerprint))
+
+    jobs = []
+    for path, job_id, meta, body, row in parsed:
+        fingerprint = fingerprints.get(job_id)
+        # Claude skipped or gave up after retries: store a local fingerprint rather than nothing.
+        if fingerprint is None and local_fallback:
+            fingerprint = extract_local_fingerprint(body, title=str(meta.get("role") or ""))
+        jobs.append({
             "job_id": job_id,
             "path": str(path),
             "bucket": bucket,
@@ -49,11 +208,83 @@ def ingest_folder(folder: Path, bucket: str, client: Optional[ClaudeClient] = No
             "body": body,
             "fingerprint": fingerprint,
             **_extract_meta(meta),
-        }
-        upsert_job(job)
-        record = next((j for j in list_jobs() if j.job_id == job_id), None)
-        if record:
-            ingested.append(record)
+        })
+        manifest_rows.append({**row, "fingerprint_source": _fingerprint_kind(fingerprint)})
+
+    upsert_jobs(jobs)
+    record_ingest_manifest(manifest_rows)
+    on_done([str(path) for path, job_id, _, _, _ in parsed if job_id in to_fingerprint])
+    records = get_jobs(job["job_id"] for job in jobs)
+    return [records[job["job_id"]] for job in jobs if job["job_id"] in records]
+
+
+def ingest_folder(
+    folder: Path,
+    bucket: str,
+    client: Optional[AnyClaudeClient] = None,
+    local_fallback: bool = True,
+    force: bool = False,
+    workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, Path], None]] = None,
+) -> List[JobRecord]:
+    """
+    Upsert the new and changed *.md files in folder into the given bucket and
+    return their records. Inbox files that repeat a posting already stored
+    (see identity.claim_jobs) are skipped.
+
+    With a client, fingerprints come from Claude. Without one, the rule-based
+    extractor fills in a fingerprint (unless local_fallback is False) so the
+    job can still be scored; it can be upgraded to a Claude fingerprint later.
+
+    The ingest_manifest table remembers each file's size, mtime and hashes:
+    files that haven't changed since their last ingest are skipped without
+    being read, and a file whose description body is unchanged keeps its
+    stored fingerprint. Files with only a local fingerprint are still
+    re-processed when a client is given, so they get upgraded. Files linked
+    to another job as duplicates are re-checked once that job is gone. force
+    ignores the manifest, e.g. after identity rules changed.
+
+    Files are read and parsed in chunks of up to INGEST_CHUNK, on a pool of
+    `workers` processes (default: one per core) for large folders; each chunk
+    is stored in one transaction as it arrives. Calls on_progress(done, total,
+    path) for every file that needed reading, as soon as it is settled: files
+    waiting on Claude are reported when their chunk's call returns.
+    """
+    def _settled(entry: Optional[Dict[str, Any]]) -> bool:
+        """The manifest entry's ingest needs no upgrade with this client."""
+        if not entry or entry["bucket"] != bucket:
+            return False
+        if entry["fingerprint_source"] == "duplicate":
+            return entry["job_id"] in canonical
+        return entry["fingerprint_source"] == "claude" or not client
+
+    paths = sorted(folder.glob("*.md"))
+    manifest = {} if force else load_ingest_manifest(str(path) for path in paths)
+    # A duplicate stays skipped only while the job it was linked to still owns
+    # identity keys; otherwise the file is read and claimed again.
+    canonical = list_job_keys(e["job_id"] for e in manifest.values() if e["fingerprint_source"] == "duplicate")
+    todo: List[Tuple[str, Optional[str]]] = []
+    for path in paths:
+        entry = manifest.get(str(path))
+        settled = _settled(entry)
+        if settled:
+            stat = path.stat()
+            if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+        todo.append((str(path), entry["content_hash"] if settled else None))
+
+    done = 0
+
+    def _on_done(done_paths: List[str]) -> None:
+        nonlocal done
+        for done_path in done_paths:
+            done += 1
+            if on_progress:
+                on_progress(done, len(todo), Path(done_path))
+
+    ingested: List[JobRecord] = []
+    for results in _iter_parsed_chunks(todo, workers):
+        ingested.extend(_store_parsed(results, bucket, manifest, client, local_fallback, _on_done))
     return ingested
 
 
@@ -82,12 +313,77 @@ def auto_import_applications_to_liked() -> int:
     return count
 
 
+def _job_markdown_meta(job: JobRecord) -> Dict[str, Any]:
+    meta = {
+        "id": job.job_id,
+        "company": job.company,
+        "role": job.role,
+        "location": job.location,
+        "level": job.level,
+        "domain": job.domain,
+        "skills": job.skills or None,
+        "source": job.source,
+        "date_saved": job.date_saved,
+    }
+    return {k: v for k, v in meta.items() if v}
+
+
+def export_jobs_to_markdown(jobs: List[JobRecord], folder: Path) -> List[Path]:
+    """
+    Write DB-only jobs (saved with save_jobs_to_db) out as markdown files in
+    folder and point their rows at them. Jobs that already have a file are skipped.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    taken = {p.name for p in folder.glob("*.md")}
+    written: List[Path] = []
+    updates: List[Dict[str, Any]] = []
+    for job in jobs:
+        if job.path and Path(job.path).exists():
+            continue
+        slug = slugify(job.job_id)
+        name, counter = f"{slug}.md", 1
+        while name in taken:
+            name = f"{slug}-{counter}.md"
+            counter += 1
+        path = folder / name
+        path.write_text(render_front_matter(_job_markdown_meta(job), job.body or ""), encoding="utf-8")
+        taken.add(name)
+        written.append(path)
+        updates.append({**_record_dict(job), "path": str(path)})
+    upsert_jobs(updates)
+    return written
+
+
+def _record_dict(job: JobRecord) -> Dict[str, Any]:
+    return {
+        "job_id": job.job_id,
+        "path": job.path,
+        "bucket": job.bucket,
+        "liked": job.liked,
+        "company": job.company,
+        "role": job.role,
+        "location": job.location,
+        "level": job.level,
+        "domain": job.domain,
+        "skills": job.skills,
+        "source": job.source,
+        "date_saved": job.date_saved,
+        "body": job.body,
+        "fingerprint": json.loads(job.fingerprint_json) if job.fingerprint_json else None,
+        "created_at": job.created_at,
+    }
+
+
 def move_to_liked(job: JobRecord) -> Path:
-    src = Path(job.path)
-    if not src.exists():
-        raise FileNotFoundError(f"Missing source file: {src}")
-    dest = get_liked_dir() / src.name
-    shutil.move(str(src), str(dest))
+    if not job.path:
+        # Saved straight to the DB by the scraper: materialise the file in liked/.
+        dest = export_jobs_to_markdown([job], get_liked_dir())[0]
+    else:
+        src = Path(job.path)
+        if not src.exists():
+            raise FileNotFoundError(f"Missing source file: {src}")
+        dest = get_liked_dir() / src.name
+        shutil.move(str(src), str(dest))
     job_update = {
         "job_id": job.job_id,
         "path": str(dest),
@@ -138,7 +434,7 @@ def bulk_generate_applications(
     seed_job: JobRecord,
     inbox_jobs: List[JobRecord],
     base_resume: str,
-    client: ClaudeClient,
+    client: AnyClaudeClient,
     top_n: int = 10,
     on_progress: Optional[Callable[[int, int, JobRecord], None]] = None,
 ) -> List[Dict[str, Any]]:
@@ -146,8 +442,9 @@ def bulk_generate_applications(
     Score inbox_jobs against seed_job's fingerprint, take the top_n matches,
     and generate a tailored resume + cover letter for each.
 
-    Calls on_progress(current_index, total, job) after each generation so the
-    caller can update a UI progress bar.
+    Calls on_progress(current_index, total, job) for each generation so the
+    caller can update a UI progress bar. With an AsyncClaudeClient the
+    generations run concurrently and progress follows completion order.
 
     Returns a list of dicts:
         {"job": JobRecord, "score": float, "folder": Path | None, "error": str | None}
@@ -172,6 +469,27 @@ def bulk_generate_applications(
 
     results = []
     total = len(ranked)
+
+    if isinstance(client, AsyncClaudeClient):
+        # All generations in flight at once (bounded by the client's semaphore);
+        # progress is reported as each one lands.
+        by_id = {job.job_id: (score, job) for score, job in ranked}
+        calls = {job.job_id: (base_resume, job.body or "") for _, job in ranked}
+        for i, (job_id, outcome) in enumerate(client.map_sync(client.generate_tailored_docs, calls)):
+            score, job = by_id[job_id]
+            if on_progress:
+                on_progress(i, total, job)
+            if isinstance(outcome, BaseException):
+                results.append({"job": job, "score": score, "folder": None, "error": str(outcome)})
+                continue
+            try:
+                dest = create_application_folder(job, *outcome)
+                results.append({"job": job, "score": score, "folder": dest, "error": None})
+            except Exception as exc:
+                results.append({"job": job, "score": score, "folder": None, "error": str(exc)})
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results
+
     for i, (score, job) in enumerate(ranked):
         if on_progress:
             on_progress(i, total, job)
@@ -1,90 +1,576 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
-from typing import Any, Dict, Optional, Tuple
+import threading
+from concurrent.futures import as_completed
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Union
 
 import requests
 
+from .preprocess import compress_job_text
+from .ratelimit import retry_after_seconds
 
-class ClaudeClient:
-    def __init__(self, api_key: str, model: Optional[str] = None):
+SENIORITY_LEVELS = ["intern", "entry", "mid", "senior", "manager", "director", "exec", "unknown"]
+LOCATION_TYPES = ["onsite", "hybrid", "remote", "unknown"]
+FINGERPRINT_LIST_FIELDS = ["industries", "domains", "skills", "tools", "responsibilities", "keywords"]
+
+FINGERPRINT_SYSTEM = (
+    "You extract structured job fingerprints for similarity matching. "
+    "Always answer by calling the provided tool."
+)
+
+FINGERPRINT_SPEC = (
+    "All list fields must be arrays of strings (lowercase, no duplicates). "
+    "Use seniority and location_type 'unknown' when the posting does not say."
+)
+
+DOCS_SYSTEM = (
+    "You are a resume and cover letter writer. "
+    "Always answer by calling the provided tool."
+)
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+FINGERPRINT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "role_title": {"type": "string"},
+        "role_family": {"type": "string"},
+        "seniority": {"type": "string", "enum": SENIORITY_LEVELS},
+        "location_type": {"type": "string", "enum": LOCATION_TYPES},
+        **{name: _STRING_LIST for name in FINGERPRINT_LIST_FIELDS},
+    },
+    "required": ["role_title", "role_family", "seniority", "location_type", *FINGERPRINT_LIST_FIELDS],
+}
+
+FINGERPRINT_TOOL: Dict[str, Any] = {
+    "name": "record_fingerprint",
+    "description": "Record the structured fingerprint of one job description.",
+    "input_schema": FINGERPRINT_SCHEMA,
+}
+
+PACKED_FINGERPRINT_TOOL: Dict[str, Any] = {
+    "name": "record_fingerprints",
+    "description": "Record the structured fingerprint of every job description, keyed by job_id.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "fingerprints": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"job_id": {"type": "string"}, "fingerprint": FINGERPRINT_SCHEMA},
+                    "required": ["job_id", "fingerprint"],
+                },
+            }
+        },
+        "required": ["fingerprints"],
+    },
+}
+
+DOCS_TOOL: Dict[str, Any] = {
+    "name": "record_application_docs",
+    "description": "Record the tailored resume and cover letter as markdown.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "resume_md": {"type": "string"},
+            "cover_letter_md": {"type": "string"},
+        },
+        "required": ["resume_md", "cover_letter_md"],
+    },
+}
+
+# Jobs at or under this many characters (after preprocessing) are worth packing;
+# longer ones go out on their own.
+PACKED_MAX_CHARS = 1500
+PACKED_BATCH_SIZE = 8
+# Attempts per job before giving up on a structured reply.
+MAX_ATTEMPTS = 3
+
+
+T = TypeVar("T")
+
+
+class ClaudeOutputError(ValueError):
+    """Claude kept returning output that failed validation."""
+
+
+class _ClaudeBase:
+    """Configuration, prompts and reply handling shared by the sync and async clients."""
+
+    def __init__(self, api_key: str, model: Optional[str] = None, compress: bool = True):
         self.api_key = api_key
         self.model = model or os.environ.get("CLAUDE_MODEL") or "claude-sonnet-4-20250514"
         self.base_url = "https://api.anthropic.com/v1/messages"
+        self.compress = compress
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "tokens_saved": 0,
+            "parsed": 0,
+            "parse_failures": 0,
+        }
+
+    @property
+    def parse_failure_rate(self) -> float:
+        """Share of structured replies that failed validation and needed a retry."""
+        total = self.stats["parsed"] + self.stats["parse_failures"]
+        return self.stats["parse_failures"] / total if total else 0.0
 
-    def _request(self, system: str, user: str, max_tokens: int = 1200) -> Dict[str, Any]:
-        headers = {
+    def _prepare_job_text(self, job_text: str) -> str:
+        """Strip boilerplate before submission and keep a running tokens-saved tally."""
+        if not self.compress:
+            return job_text
+        compressed = compress_job_text(job_text)
+        self.stats["tokens_saved"] += compressed.tokens_saved
+        return compressed.text
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "x-api-key": self.api_key,
             "anthropic-version": "2023-06-01",
             "content-type": "application/json",
         }
-        payload = {
+
+    def _payload(self, system: str, user: str, max_tokens: int, tool: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
             "model": self.model,
             "max_tokens": max_tokens,
             "system": system,
             "messages": [{"role": "user", "content": user}],
         }
-        resp = requests.post(self.base_url, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        content = data.get("content") or []
-        text = ""
-        for block in content:
-            if block.get("type") == "text":
-                text += block.get("text", "")
-        return {"text": text, "raw": data}
+        if tool:
+            payload["tools"] = [tool]
+            payload["tool_choice"] = {"type": "tool", "name": tool["name"]}
+        return payload
 
-    def extract_fingerprint(self, job_text: str) -> Dict[str, Any]:
-        system = (
-            "You extract structured job fingerprints for similarity matching. "
-            "Return ONLY valid JSON without markdown or commentary."
-        )
-        user = (
+    def _record_parse(self, ok: bool) -> None:
+        self.stats["parsed" if ok else "parse_failures"] += 1
+
+    def _fingerprint_prompt(self, job_text: str) -> str:
+        return (
             "Extract a concise fingerprint of this job description. "
-            "Return JSON with keys: role_title, role_family, seniority, industries, domains, "
-            "skills, tools, responsibilities, keywords, location_type. "
-            "All list fields must be arrays of strings (lowercase, no duplicates). "
-            "seniority should be one of: intern, entry, mid, senior, manager, director, exec, unknown. "
-            "location_type should be one of: onsite, hybrid, remote, unknown.\n\n"
+            f"{FINGERPRINT_SPEC}\n\n"
             f"JOB DESCRIPTION:\n{job_text}\n"
         )
-        result = self._request(system, user, max_tokens=1200)
-        return _parse_json(result["text"])
 
-    def generate_tailored_docs(self, base_resume: str, job_text: str) -> Tuple[str, str]:
-        system = (
-            "You are a resume and cover letter writer. "
-            "Return ONLY valid JSON without markdown or commentary."
+    def _packed_prompt(self, batch: Dict[str, str]) -> str:
+        sections = "\n\n".join(f"=== JOB {job_id} ===\n{text}" for job_id, text in batch.items())
+        return (
+            f"Extract a concise fingerprint for each of the {len(batch)} job descriptions below. "
+            "Return one entry per job, with job_id set to the id after JOB. "
+            f"{FINGERPRINT_SPEC}\n\n"
+            f"{sections}\n"
         )
-        user = (
+
+    def _read_packed(self, tool_input: Dict[str, Any], batch: List[str]) -> Dict[str, Dict[str, Any]]:
+        items = tool_input.get("fingerprints") if isinstance(tool_input, dict) else None
+        by_id: Dict[str, Any] = {}
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict):
+                by_id.setdefault(str(item.get("job_id", "")), item.get("fingerprint"))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for job_id in batch:
+            # A job the model skipped counts as a parse failure, like a malformed one.
+            fingerprint, errors = validate_fingerprint(by_id.get(job_id))
+            self._record_parse(not errors)
+            if not errors:
+                results[job_id] = fingerprint
+        return results
+
+    def _docs_prompt(self, base_resume: str, job_text: str) -> str:
+        return (
             "Create a tailored resume and cover letter using the base resume and job description. "
-            "Return JSON with keys: resume_md, cover_letter_md. "
             "Keep resume concise (1-2 pages in markdown). "
             "Use bullet points, preserve factual accuracy from base resume, and align to job keywords. "
             "Do not invent roles, dates, degrees, or metrics.\n\n"
             f"BASE RESUME (SOURCE OF TRUTH):\n{base_resume}\n\n"
             f"JOB DESCRIPTION:\n{job_text}\n"
         )
-        result = self._request(system, user, max_tokens=4000)
-        data = _parse_json(result["text"])
-        resume_md = data.get("resume_md", "")
-        cover_letter_md = data.get("cover_letter_md", "")
-        return resume_md.strip(), cover_letter_md.strip()
-
-
-def _parse_json(text: str) -> Dict[str, Any]:
-    text = text.strip()
-    if not text:
-        return {}
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
+
+
+class ClaudeClient(_ClaudeBase):
+    def _request(
+        self,
+        system: str,
+        user: str,
+        max_tokens: int = 1200,
+        tool: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        self.stats["calls"] += 1
+        resp = requests.post(
+            self.base_url,
+            headers=self._headers(),
+            json=self._payload(system, user, max_tokens, tool),
+            timeout=60,
+        )
+        resp.raise_for_status()
+        return _read_response(resp.json())
+
+    def extract_fingerprint(self, job_text: str) -> Dict[str, Any]:
+        return self._extract_fingerprint(self._prepare_job_text(job_text))
+
+    def _extract_fingerprint(self, job_text: str) -> Dict[str, Any]:
+        user = self._fingerprint_prompt(job_text)
+        errors: List[str] = []
+        for _ in range(MAX_ATTEMPTS):
+            result = self._request(FINGERPRINT_SYSTEM, user, max_tokens=1200, tool=FINGERPRINT_TOOL)
+            fingerprint, errors = validate_fingerprint(result["input"])
+            self._record_parse(not errors)
+            if not errors:
+                return fingerprint
+        raise ClaudeOutputError(f"Invalid fingerprint after {MAX_ATTEMPTS} attempts: {'; '.join(errors)}")
+
+    def extract_fingerprints_packed(
+        self,
+        jobs: Dict[str, str],
+        batch_size: int = PACKED_BATCH_SIZE,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fingerprint several short jobs per request.
+
+        jobs maps job_id -> job text. Each batch asks for an array of
+        {"job_id", "fingerprint"} objects; any job missing from the reply or
+        whose fingerprint fails validation is retried on its own with
+        extract_fingerprint. Returns job_id -> fingerprint; jobs that still
+        fail validation after the retries are left out.
+        """
+        prepared = {job_id: self._prepare_job_text(text) for job_id, text in jobs.items()}
+        return self._fingerprints_packed(prepared, batch_size)
+
+    def _fingerprints_packed(
+        self, prepared: Dict[str, str], batch_size: int = PACKED_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        ids = list(prepared)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            if len(batch) == 1:
+                continue
+            user = self._packed_prompt({job_id: prepared[job_id] for job_id in batch})
+            try:
+                result = self._request(
+                    FINGERPRINT_SYSTEM, user, max_tokens=700 * len(batch), tool=PACKED_FINGERPRINT_TOOL
+                )
+            except requests.RequestException:
+                continue
+            results.update(self._read_packed(result["input"], batch))
+
+        for job_id in ids:
+            if job_id not in results:
+                try:
+                    results[job_id] = self._extract_fingerprint(prepared[job_id])
+                except ClaudeOutputError:
+                    continue
+        return results
+
+    def generate_tailored_docs(self, base_resume: str, job_text: str) -> Tuple[str, str]:
+        user = self._docs_prompt(base_resume, self._prepare_job_text(job_text))
+        errors: List[str] = []
+        for _ in range(MAX_ATTEMPTS):
+            result = self._request(DOCS_SYSTEM, user, max_tokens=4000, tool=DOCS_TOOL)
+            docs, errors = validate_docs(result["input"])
+            self._record_parse(not errors)
+            if not errors:
+                return docs
+        raise ClaudeOutputError(f"Invalid documents after {MAX_ATTEMPTS} attempts: {'; '.join(errors)}")
+
+
+class AsyncClaudeClient(_ClaudeBase):
+    """
+    asyncio client with the same surface as ClaudeClient.
+
+    All requests share one httpx connection pool and an asyncio.Semaphore caps
+    how many are in flight. The client owns a background event loop so the
+    *_sync wrappers (and map_sync) can be called from Streamlit's script
+    thread while the pool stays warm between calls.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: Optional[str] = None,
+        compress: bool = True,
+        max_concurrency: int = 16,
+    ):
+        super().__init__(api_key, model=model, compress=compress)
+        import httpx
+
+        self.max_concurrency = max_concurrency
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="claude-async", daemon=True)
+        self._thread.start()
+
+        async def _setup() -> None:
+            self._http = httpx.AsyncClient(
+                timeout=60,
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self._run(_setup())
+
+    # ── Loop plumbing ──
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._run(self._http.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+    def map_sync(
+        self,
+        func: Callable[..., Awaitable[T]],
+        items: Dict[str, Tuple[Any, ...]],
+    ) -> Iterator[Tuple[str, Union[T, BaseException]]]:
+        """
+        Run func(*args) for every key -> args in items concurrently and yield
+        (key, result_or_exception) in completion order, in the caller's thread
+        (so progress callbacks can touch the Streamlit UI).
+        """
+        futures = {
+            asyncio.run_coroutine_threadsafe(func(*args), self._loop): key
+            for key, args in items.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                yield key, future.result()
+            except Exception as exc:
+                yield key, exc
+
+    # ── Async surface ──
+
+    async def _request(
+        self,
+        system: str,
+        user: str,
+        max_tokens: int = 1200,
+        tool: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        payload = self._payload(system, user, max_tokens, tool)
+        for attempt in range(MAX_ATTEMPTS):
+            async with self._semaphore:
+                self.stats["calls"] += 1
+                resp = await self._http.post(self.base_url, headers=self._headers(), json=payload)
+            # Rate limited / overloaded: back off instead of failing the whole batch.
+            if resp.status_code not in (429, 529) or attempt == MAX_ATTEMPTS - 1:
+                break
+            # Sleep outside the semaphore so other requests keep the slot busy meanwhile.
+            retry_after = retry_after_seconds(resp.headers.get("retry-after"))
+            await asyncio.sleep(retry_after if retry_after is not None else 2 ** attempt)
+        resp.raise_for_status()
+        return _read_response(resp.json())
+
+    async def extract_fingerprint(self, job_text: str) -> Dict[str, Any]:
+        return await self._extract_fingerprint(self._prepare_job_text(job_text))
+
+    async def _extract_fingerprint(self, job_text: str) -> Dict[str, Any]:
+        user = self._fingerprint_prompt(job_text)
+        errors: List[str] = []
+        for _ in range(MAX_ATTEMPTS):
+            result = await self._request(FINGERPRINT_SYSTEM, user, max_tokens=1200, tool=FINGERPRINT_TOOL)
+            fingerprint, errors = validate_fingerprint(result["input"])
+            self._record_parse(not errors)
+            if not errors:
+                return fingerprint
+        raise ClaudeOutputError(f"Invalid fingerprint after {MAX_ATTEMPTS} attempts: {'; '.join(errors)}")
+
+    async def extract_fingerprints_packed(
+        self,
+        jobs: Dict[str, str],
+        batch_size: int = PACKED_BATCH_SIZE,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Same contract as ClaudeClient.extract_fingerprints_packed, with batches in flight together."""
+        prepared = {job_id: self._prepare_job_text(text) for job_id, text in jobs.items()}
+        return await self._fingerprints_packed(prepared, batch_size)
+
+    async def _fingerprints_packed(
+        self, prepared: Dict[str, str], batch_size: int = PACKED_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        import httpx
+
+        ids = list(prepared)
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        async def _batch(batch: List[str]) -> Dict[str, Dict[str, Any]]:
+            if len(batch) == 1:
+                return {}
+            user = self._packed_prompt({job_id: prepared[job_id] for job_id in batch})
             try:
-                return json.loads(text[start : end + 1])
-            except json.JSONDecodeError:
+                result = await self._request(
+                    FINGERPRINT_SYSTEM, user, max_tokens=700 * len(batch), tool=PACKED_FINGERPRINT_TOOL
+                )
+            except httpx.HTTPError:
                 return {}
-    return {}
+            return self._read_packed(result["input"], batch)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for found in await asyncio.gather(*(_batch(b) for b in batches)):
+            results.update(found)
+
+        missing = [job_id for job_id in ids if job_id not in results]
+        retried = await asyncio.gather(
+            *(self._extract_fingerprint(prepared[job_id]) for job_id in missing),
+            return_exceptions=True,
+        )
+        for job_id, fingerprint in zip(missing, retried):
+            if isinstance(fingerprint, dict):
+                results[job_id] = fingerprint
+            elif not isinstance(fingerprint, ClaudeOutputError):
+                raise fingerprint
+        return results
+
+    async def generate_tailored_docs(self, base_resume: str, job_text: str) -> Tuple[str, str]:
+        user = self._docs_prompt(base_resume, self._prepare_job_text(job_text))
+        errors: List[str] = []
+        for _ in range(MAX_ATTEMPTS):
+            result = await self._request(DOCS_SYSTEM, user, max_tokens=4000, tool=DOCS_TOOL)
+            docs, errors = validate_docs(result["input"])
+            self._record_parse(not errors)
+            if not errors:
+                return docs
+        raise ClaudeOutputError(f"Invalid documents after {MAX_ATTEMPTS} attempts: {'; '.join(errors)}")
+
+    # ── Sync wrappers (Streamlit) ──
+
+    def extract_fingerprint_sync(self, job_text: str) -> Dict[str, Any]:
+        return self._run(self.extract_fingerprint(job_text))
+
+    def extract_fingerprints_packed_sync(
+        self, jobs: Dict[str, str], batch_size: int = PACKED_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        return self._run(self.extract_fingerprints_packed(jobs, batch_size=batch_size))
+
+    def generate_tailored_docs_sync(self, base_resume: str, job_text: str) -> Tuple[str, str]:
+        return self._run(self.generate_tailored_docs(base_resume, job_text))
+
+
+AnyClaudeClient = Union[ClaudeClient, AsyncClaudeClient]
+
+
+def claude_call_errors(client: AnyClaudeClient) -> Tuple[Type[Exception], ...]:
+    """
+    What a failed Claude call raises with this client: invalid or unreadable
+    replies (ClaudeOutputError is a ValueError), HTTP errors such as a bad key
+    or exhausted quota, and network failures.
+    """
+    if isinstance(client, AsyncClaudeClient):
+        import httpx
+
+        return (ValueError, httpx.HTTPError)
+    return (ValueError, requests.RequestException)
+
+
+def claude_fingerprints(client: AnyClaudeClient, jobs: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fingerprint job_id -> body with Claude. Short postings (RSS snippets, alert
+    items) share packed requests; the rest go one per request, concurrently
+    when the client is async. Jobs Claude gave up on are left out.
+    """
+    # Compress once and size on what is actually sent: a long posting that is
+    # mostly boilerplate packs like a short one.
+    prepared = {job_id: client._prepare_job_text(body) for job_id, body in jobs.items()}
+    short = {job_id: text for job_id, text in prepared.items() if len(text) <= PACKED_MAX_CHARS}
+    if len(short) < 2:
+        short = {}
+    single = {job_id: text for job_id, text in prepared.items() if job_id not in short}
+
+    if isinstance(client, AsyncClaudeClient):
+        results = client._run(client._fingerprints_packed(short)) if short else {}
+        for job_id, fingerprint in client.map_sync(
+            client._extract_fingerprint, {job_id: (text,) for job_id, text in single.items()}
+        ):
+            if isinstance(fingerprint, ClaudeOutputError):
+                continue
+            if isinstance(fingerprint, BaseException):
+                raise fingerprint
+            results[job_id] = fingerprint
+        return results
+
+    results = client._fingerprints_packed(short) if short else {}
+    for job_id, text in single.items():
+        try:
+            results[job_id] = client._extract_fingerprint(text)
+        except ClaudeOutputError:
+            continue
+    return results
+
+
+def _read_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Collect text blocks and the (first) tool_use input from a Messages API reply."""
+    text = ""
+    tool_input: Dict[str, Any] = {}
+    for block in data.get("content") or []:
+        if block.get("type") == "text":
+            text += block.get("text", "")
+        elif block.get("type") == "tool_use" and not tool_input:
+            tool_input = block.get("input") or {}
+    return {"text": text, "input": tool_input, "raw": data}
+
+
+def validate_fingerprint(value: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Check a fingerprint against FINGERPRINT_SCHEMA and normalise it.
+
+    Returns (fingerprint, errors). List fields are lowercased and
+    de-duplicated; an empty errors list means the fingerprint is usable.
+    """
+    if not isinstance(value, dict):
+        return {}, ["not an object"]
+
+    errors: List[str] = []
+    fp: Dict[str, Any] = {}
+    for key in ("role_title", "role_family"):
+        raw = value.get(key)
+        if not isinstance(raw, str):
+            errors.append(f"{key} missing")
+            raw = ""
+        fp[key] = raw.strip().lower()
+    if not fp["role_title"]:
+        errors.append("role_title empty")
+
+    for key, allowed in (("seniority", SENIORITY_LEVELS), ("location_type", LOCATION_TYPES)):
+        raw = str(value.get(key) or "").strip().lower()
+        if raw not in allowed:
+            errors.append(f"{key} {raw!r} not one of {allowed}")
+        fp[key] = raw
+
+    for key in FINGERPRINT_LIST_FIELDS:
+        raw = value.get(key)
+        if not isinstance(raw, list):
+            errors.append(f"{key} not a list")
+            raw = []
+        seen: List[str] = []
+        for item in raw:
+            item = str(item).strip().lower()
+            if item and item not in seen:
+                seen.append(item)
+        fp[key] = seen
+    if not fp["skills"] and not fp["keywords"]:
+        errors.append("skills and keywords both empty")
+
+    return fp, errors
+
+
+def validate_docs(value: Any) -> Tuple[Tuple[str, str], List[str]]:
+    if not isinstance(value, dict):
+        return ("", ""), ["not an object"]
+    resume_md = value.get("resume_md")
+    cover_letter_md = value.get("cover_letter_md")
+    errors = [
+        f"{key} empty"
+        for key, doc in (("resume_md", resume_md), ("cover_letter_md", cover_letter_md))
+        if not isinstance(doc, str) or not doc.strip()
+    ]
+    if errors:
+        return ("", ""), errors
+    return (resume_md.strip(), cover_letter_md.strip()), errors
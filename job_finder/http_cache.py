@@ -0,0 +1,181 @@
+"""
+On-disk HTTP cache for the scraper.
+
+Bodies are stored in data/http_cache.db keyed by URL together with their
+ETag/Last-Modified validators and fetch time. Entries younger than the TTL for
+their endpoint kind are served without touching the network; older ones are
+revalidated with a conditional GET, so an unchanged page costs a 304 instead of
+a full download. Total body size is bounded by evicting least-recently-used rows.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import get_data_dir
+
+# Seconds an entry is served without revalidation, per endpoint kind.
+DEFAULT_TTLS: Dict[str, float] = {
+    "search": 60 * 60,
+    "detail": 7 * 24 * 60 * 60,
+    "rss": 30 * 60,
+}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Check the size bound every this many writes rather than on each one.
+_EVICT_EVERY = 32
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def _cache_path() -> Path:
+    return get_data_dir() / "http_cache.db"
+
+
+class HttpCache:
+    """URL → body store with validators, TTL lookups and LRU size eviction."""
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or _cache_path()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._init()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                body TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            );
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at);")
+        conn.commit()
+        conn.close()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT url, body, etag, last_modified, fetched_at FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (time.time(), url))
+                conn.commit()
+            conn.close()
+        if not row:
+            return None
+        return CacheEntry(
+            url=row["url"],
+            body=row["body"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            fetched_at=row["fetched_at"],
+        )
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT INTO http_cache (url, body, etag, last_modified, fetched_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    body=excluded.body,
+                    etag=excluded.etag,
+                    last_modified=excluded.last_modified,
+                    fetched_at=excluded.fetched_at,
+                    accessed_at=excluded.accessed_at,
+                    size=excluded.size
+                """,
+                (url, body, etag, last_modified, now, now, len(body.encode("utf-8"))),
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict(conn)
+            conn.close()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as freshly validated (after a 304)."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE http_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            conn.commit()
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so we don't evict again on the very next write.
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for row in conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at"):
+            doomed.append((row["url"],))
+            freed += row["size"] or 0
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM http_cache WHERE url = ?", doomed)
+        conn.commit()
+
+    def evict(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            self._evict(conn)
+            conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM http_cache")
+            conn.commit()
+            conn.close()
+
+
+_CACHES: Dict[str, HttpCache] = {}
+
+
+def get_http_cache() -> HttpCache:
+    """Shared cache for the current workspace's data dir."""
+    path = _cache_path()
+    cache = _CACHES.get(str(path))
+    if cache is None:
+        cache = HttpCache(path)
+        _CACHES[str(path)] = cache
+    return cache
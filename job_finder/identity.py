@@ -0,0 +1,251 @@
+"""
+Canonical identity for job postings across sources.
+
+The same posting can arrive as a LinkedIn card, an Indeed RSS item, an alert
+feed entry or a hand-saved markdown file, each with a different job_id.
+identity_keys() derives what survives those differences: the source-native ID
+(LinkedIn job ID, Indeed jk), the normalised URL when it points at one posting,
+and a hash of normalised company + title + location. claim_jobs() checks those
+keys against the job_keys index in jobs.db, so a repeat is linked to the job
+already stored (job_duplicates) instead of being saved, fingerprinted and
+scored again. Native IDs are authoritative: two postings with different IDs
+from the same site are never merged on a URL or content match.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+
+from .storage import (
+    has_job_keys,
+    link_job_duplicates,
+    list_job_keys,
+    list_jobs,
+    record_job_keys,
+    resolve_job_keys,
+)
+
+SOURCE_URL_RE = re.compile(r"https?://[^\s)]+")
+# Query parameters that say how a link was reached, not which posting it is.
+TRACKING_PARAMS = {
+    "trk", "trkinfo", "refid", "trackingid", "position", "pagenum", "src", "from", "ref",
+    "source", "campaign", "gclid", "fbclid", "mc_cid", "mc_eid", "sid", "tk", "vjs",
+}
+_LEGAL_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "plc", "gmbh", "lp", "llp", "the"}
+# Key prefixes that carry a site's own posting ID.
+NATIVE_SOURCES = ("linkedin", "indeed")
+# A URL names one posting if its query carries a posting ID or its last path
+# segment looks like one (a long number, an ATS UUID, a requisition code).
+_POSTING_QUERY_KEYS = {"jk", "gh_jid", "jobid", "job_id", "jid", "postingid", "reqid", "requisitionid"}
+_POSTING_ID_RE = re.compile(r"\d{4,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+_LISTING_SEGMENTS = {"search", "results", "jobs", "careers", "career", "openings", "positions"}
+
+
+def extract_job_id_from_href(href: str) -> Optional[str]:
+    """Pull the numeric job ID from a LinkedIn /jobs/view/ URL."""
+    # Pattern: /jobs/view/some-title-at-company-1234567890
+    m = re.search(r"/jobs/view/[^?/]*?(\d{8,})", href)
+    if m:
+        return m.group(1)
+    # Fallback: just find any long number in the URL
+    m = re.search(r"(\d{9,})", href)
+    return m.group(1) if m else None
+
+
+def posting_key(url: str) -> Optional[Tuple[str, str]]:
+    """(source, native id) that identifies a posting across runs: the LinkedIn job ID, Indeed's jk, or its URL; None for listing pages."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if "linkedin." in host:
+        job_id = extract_job_id_from_href(url)
+        return ("linkedin", job_id) if job_id else None
+    if "indeed." in host:
+        jk = parse_qs(parts.query).get("jk")
+        if jk:
+            return ("indeed", jk[0])
+    if not is_posting_url(url):
+        return None
+    canonical = host + parts.path.rstrip("/")
+    return ("url", f"{canonical}?{parts.query}" if parts.query else canonical)
+
+
+def canonical_url(url: str) -> str:
+    """host/path?query with the scheme, www., fragment, trailing slash and tracking parameters removed."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().split("@")[-1]
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if not host:
+        return ""
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+
+def is_posting_url(url: str) -> bool:
+    """True for a link to one posting; False for careers, listing and search pages."""
+    parts = urlsplit(url.strip())
+    if {key.lower() for key, _ in parse_qsl(parts.query)} & _POSTING_QUERY_KEYS:
+        return True
+    segments = [segment.lower() for segment in parts.path.split("/") if segment]
+    if len(segments) < 2 or segments[-1] in _LISTING_SEGMENTS or "search" in segments:
+        return False
+    return bool(_POSTING_ID_RE.search(segments[-1]))
+
+
+def _words(value: str) -> List[str]:
+    return re.sub(r"[^a-z0-9+#]+", " ", value.lower()).split()
+
+
+def content_key(company: Optional[str], title: Optional[str], location: Optional[str] = None) -> Optional[str]:
+    """Hash of normalised company, title and location; None without a real company and title."""
+    if not company or not title or company.startswith("Unknown"):
+        return None
+    company_words = [w for w in _words(company) if w not in _LEGAL_SUFFIXES]
+    title_words = _words(title)
+    if not company_words or not title_words:
+        return None
+    # Kept whole: "Remote - US" and "Remote - EU" are different postings.
+    loc = " ".join(_words(location or ""))
+    raw = f"{' '.join(company_words)}|{' '.join(title_words)}|{loc}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def identity_keys(
+    url: Optional[str] = None,
+    company: Optional[str] = None,
+    title: Optional[str] = None,
+    location: Optional[str] = None,
+) -> List[str]:
+    """Index keys for a posting, strongest first: native ID, canonical posting URL, content hash."""
+    keys = []
+    if url:
+        native = posting_key(url)
+        if native and native[0] != "url":
+            keys.append(f"{native[0]}:{native[1]}")
+        canonical = canonical_url(url) if is_posting_url(url) else ""
+        if canonical:
+            keys.append(f"url:{canonical}")
+    content = content_key(company, title, location)
+    if content:
+        keys.append(f"content:{content}")
+    return keys
+
+
+def job_identity_keys(job: Dict) -> List[str]:
+    """identity_keys for a scraped job (url, title) or a stored/ingested one (source text, role)."""
+    url = job.get("url")
+    if not url:
+        m = SOURCE_URL_RE.search(str(job.get("source") or ""))
+        url = m.group(0) if m else None
+    return identity_keys(url, job.get("company"), job.get("title") or job.get("role"), job.get("location"))
+
+
+def _ensure_index() -> None:
+    """Index jobs stored before job_keys existed, once."""
+    if has_job_keys():
+        return
+    record_job_keys(
+        (key, job.job_id)
+        for job in list_jobs()
+        for key in job_identity_keys({"source": job.source, "company": job.company, "role": job.role, "location": job.location})
+    )
+
+
+def index_jobs(jobs: Iterable[Tuple[str, Dict]]) -> None:
+    """Record the identity keys of (job_id, job) pairs; keys already claimed keep their job."""
+    _ensure_index()
+    record_job_keys((key, job_id) for job_id, job in jobs for key in job_identity_keys(job))
+
+
+def _native_ids(keys: Iterable[str]) -> Dict[str, str]:
+    """source -> native ID among identity keys."""
+    return dict(key.split(":", 1) for key in keys if key.split(":", 1)[0] in NATIVE_SOURCES)
+
+
+def _conflicts(a: Dict[str, str], b: Dict[str, str]) -> bool:
+    """Both carry an ID from the same site, and the IDs differ."""
+    return any(source in b and b[source] != native for source, native in a.items())
+
+
+def _repeat_of(
+    job_id: str, keys: List[str], owners: Dict[str, str], natives: Dict[str, Dict[str, str]]
+) -> Optional[str]:
+    """The other job owning one of keys, unless the two carry different native IDs from the same site."""
+    own_natives = _native_ids(keys)
+    return next(
+        (
+            owners[key] for key in keys
+            if key in owners and owners[key] != job_id and not _conflicts(own_natives, natives.get(owners[key], {}))
+        ),
+        None,
+    )
+
+
+def _claim_keys(
+    job_id: str, keys: List[str], owners: Dict[str, str], natives: Dict[str, Dict[str, str]]
+) -> List[Tuple[str, str]]:
+    """Give job_id the keys nobody owns yet; returns the (key, job_id) pairs claimed."""
+    natives.setdefault(job_id, {}).update(_native_ids(keys))
+    claimed = [(key, job_id) for key in keys if key not in owners]
+    owners.update(claimed)
+    return claimed
+
+
+class RunClaims:
+    """claim_jobs for the postings of one run, in memory: same keys, same native-ID veto, nothing stored."""
+
+    def __init__(self) -> None:
+        self.owners: Dict[str, str] = {}
+        self.natives: Dict[str, Dict[str, str]] = {}
+
+    def claim(self, job_id: str, job: Dict) -> bool:
+        """Claim the posting's keys; False when job_id, or a posting it repeats, was claimed before."""
+        if job_id in self.natives:
+            return False
+        keys = job_identity_keys(job)
+        if _repeat_of(job_id, keys, self.owners, self.natives):
+            return False
+        _claim_keys(job_id, keys, self.owners, self.natives)
+        return True
+
+
+def claim_jobs(jobs: List[Tuple[str, Dict]], source: str = "") -> Dict[str, str]:
+    """
+    Split (job_id, job) pairs into new postings and repeats of stored ones.
+
+    New postings have their keys claimed (earlier pairs win within the batch).
+    Repeats are linked to the job that owns the key in job_duplicates and
+    returned as job_id -> canonical job_id so callers can skip them. A pair
+    whose keys already belong to its own job_id is an update, not a repeat.
+    A URL or content match is not a repeat when both postings carry different
+    native IDs from the same site.
+    """
+    _ensure_index()
+    keys_by_job = [(job_id, job, job_identity_keys(job)) for job_id, job in jobs]
+    owners = resolve_job_keys(key for _, _, keys in keys_by_job for key in keys)
+    natives = {job_id: _native_ids(keys) for job_id, keys in list_job_keys(set(owners.values())).items()}
+
+    duplicates: Dict[str, str] = {}
+    claimed: List[Tuple[str, str]] = []
+    links: List[Tuple[str, str, str, Optional[str]]] = []
+    for job_id, job, keys in keys_by_job:
+        canonical = _repeat_of(job_id, keys, owners, natives)
+        if canonical and job_id not in (owners.get(key) for key in keys):
+            duplicates[job_id] = canonical
+            links.append((job_id, canonical, source, job.get("url") or job.get("source")))
+            continue
+        claimed += _claim_keys(job_id, keys, owners, natives)
+
+    record_job_keys(claimed)
+    link_job_duplicates(links)
+    return duplicates
@@ -0,0 +1,287 @@
+"""
+Rule-based job fingerprints — no API key, no network.
+Produces the same JSON shape as ClaudeClient.extract_fingerprint from
+precompiled phrase vocabularies, so jobs can be scored immediately and
+upgraded to a Claude fingerprint later.
+
+The body is tokenized once and scanned with a first-word phrase index,
+which keeps extraction well under a millisecond for a typical posting.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+LOCAL_SOURCE = "local"
+
+# ── Vocabularies ──────────────────────────────────────────────────────────────
+# Keys are the canonical value stored in the fingerprint, values are the
+# literal phrases (lowercase) that map to it.
+
+_SKILLS: Dict[str, List[str]] = {
+    "python": ["python"],
+    "sql": ["sql", "t-sql", "pl/sql"],
+    "machine learning": ["machine learning", "ml model", "ml models"],
+    "deep learning": ["deep learning", "neural network", "neural networks"],
+    "generative ai": ["generative ai", "genai", "gen ai", "llm", "llms", "large language model", "large language models"],
+    "ai": ["ai", "artificial intelligence"],
+    "nlp": ["nlp", "natural language processing"],
+    "data analysis": ["data analysis", "data analytics", "analytics"],
+    "data engineering": ["data engineering", "data pipeline", "data pipelines", "etl", "elt"],
+    "data visualization": ["data visualization", "dashboard", "dashboards", "visualization"],
+    "statistics": ["statistics", "statistical"],
+    "financial modeling": ["financial modeling", "financial modelling", "financial model", "financial models"],
+    "forecasting": ["forecasting", "forecast", "forecasts"],
+    "budgeting": ["budgeting", "budget", "budgets"],
+    "fp&a": ["fp&a", "financial planning and analysis", "financial planning & analysis"],
+    "accounting": ["accounting", "gaap", "ifrs"],
+    "financial reporting": ["financial reporting", "month-end close", "month end close"],
+    "project management": ["project management", "program management"],
+    "product management": ["product management", "product roadmap", "product roadmaps"],
+    "stakeholder management": ["stakeholder management", "stakeholder", "stakeholders"],
+    "consulting": ["consulting", "client-facing", "client facing"],
+    "strategy": ["strategy", "strategic planning"],
+    "process improvement": ["process improvement", "process optimization", "process optimisation", "lean", "six sigma"],
+    "automation": ["automation", "automate", "rpa"],
+    "leadership": ["leadership", "team lead", "people management"],
+    "communication": ["communication skills", "presentation skills", "storytelling"],
+    "software development": ["software development", "software engineering"],
+    "api development": ["api", "apis", "rest api", "restful"],
+    "cloud": ["cloud", "cloud computing"],
+    "devops": ["devops", "ci/cd", "continuous integration"],
+    "agile": ["agile", "scrum"],
+    "change management": ["change management"],
+    "risk management": ["risk management", "risk assessment"],
+    "compliance": ["compliance", "regulatory"],
+}
+
+_TOOLS: Dict[str, List[str]] = {
+    "excel": ["excel", "spreadsheet", "spreadsheets"],
+    "power bi": ["power bi", "powerbi"],
+    "tableau": ["tableau"],
+    "looker": ["looker"],
+    "snowflake": ["snowflake"],
+    "databricks": ["databricks"],
+    "spark": ["spark", "pyspark"],
+    "pandas": ["pandas"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "pytorch": ["pytorch"],
+    "tensorflow": ["tensorflow"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure"],
+    "gcp": ["gcp", "google cloud"],
+    "sap": ["sap", "s/4hana"],
+    "oracle": ["oracle"],
+    "netsuite": ["netsuite"],
+    "workday": ["workday"],
+    "salesforce": ["salesforce"],
+    "anaplan": ["anaplan"],
+    "hyperion": ["hyperion"],
+    "alteryx": ["alteryx"],
+    "jira": ["jira"],
+    "git": ["git", "github", "gitlab"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "airflow": ["airflow"],
+    "dbt": ["dbt"],
+    "javascript": ["javascript", "typescript", "node.js", "nodejs"],
+    "react": ["react"],
+    "openai": ["openai", "chatgpt", "gpt-4"],
+    "claude": ["claude", "anthropic"],
+    "langchain": ["langchain"],
+}
+
+_DOMAINS: Dict[str, List[str]] = {
+    "finance": ["finance", "financial"],
+    "accounting": ["accounting", "audit"],
+    "banking": ["banking", "bank"],
+    "insurance": ["insurance", "underwriting"],
+    "healthcare": ["healthcare", "health care", "clinical", "hospital"],
+    "life sciences": ["life sciences", "pharma", "pharmaceutical", "pharmaceuticals", "biotech"],
+    "retail": ["retail", "e-commerce", "ecommerce"],
+    "manufacturing": ["manufacturing", "supply chain"],
+    "energy": ["energy", "utilities", "oil and gas", "oil & gas"],
+    "technology": ["technology", "saas", "software"],
+    "government": ["government", "public sector", "federal"],
+    "education": ["education", "higher ed"],
+    "real estate": ["real estate"],
+    "marketing": ["marketing", "advertising"],
+    "human resources": ["human resources", "hr", "talent"],
+    "operations": ["operations"],
+    "transformation": ["transformation", "modernization"],
+}
+
+_INDUSTRIES: Dict[str, List[str]] = {
+    "professional services": ["consulting firm", "professional services", "big 4", "advisory"],
+    "financial services": ["financial services", "fintech", "asset management", "wealth management"],
+    "healthcare": ["healthcare", "health system", "payer", "provider"],
+    "technology": ["saas", "software company", "tech company"],
+    "public sector": ["public sector", "government"],
+    "consumer": ["consumer goods", "cpg", "retail"],
+}
+
+# Role family and seniority are read from the (short) title, so regexes are fine.
+_ROLE_FAMILIES: List[Tuple[str, str]] = [
+    ("data science", r"data scien\w*|machine learning|ml engineer|ai engineer|applied scientist"),
+    ("data analytics", r"data analy\w*|analytics|business intelligence|bi developer"),
+    ("software engineering", r"software|developer|engineer(?:ing)?\b"),
+    ("finance", r"financ\w*|fp&a|accountant|controller|treasury"),
+    ("consulting", r"consult\w*|advisory|advisor"),
+    ("product management", r"product manager|product owner"),
+    ("project management", r"project manager|program manager|pmo"),
+    ("operations", r"operations|ops\b"),
+    ("strategy", r"strategy|strategist"),
+]
+
+_SENIORITY: List[Tuple[str, str]] = [
+    ("intern", r"\bintern(?:ship)?\b"),
+    ("exec", r"\b(?:chief|cfo|cto|ceo|coo|cio|vp|vice president|evp|svp|head of)\b"),
+    ("director", r"\bdirector\b"),
+    ("manager", r"\b(?:manager|managing|lead)\b"),
+    ("senior", r"\b(?:senior|sr\.?|staff|principal)\b"),
+    ("entry", r"\b(?:junior|jr\.?|entry[- ]level|associate|graduate)\b"),
+    ("mid", r"\b(?:mid[- ]level|intermediate)\b"),
+]
+
+_LOCATION_TYPES: Dict[str, List[str]] = {
+    "hybrid": ["hybrid"],
+    "remote": ["remote", "fully remote", "remote-first", "work from home"],
+    "onsite": ["onsite", "on-site", "on site", "in-office", "in office"],
+}
+
+_RESPONSIBILITY_VERBS = frozenset(
+    ["lead", "build", "develop", "design", "manage", "analyze", "deliver",
+     "drive", "partner", "own", "implement", "create", "support", "advise"]
+)
+
+_STOPWORDS = frozenset(
+    """
+    a about above across after all also an and any are as at be because been being both but by
+    can could do does each etc for from has have having how if in including into is it its
+    may more most must not of on or other our out over per such than that the their them
+    then there these they this those through to under up us using via was we well were what
+    when where which while who will with within would you your ability able experience work
+    working role team teams job position candidate candidates strong new years year
+    required preferred plus skills knowledge requirements responsibilities qualifications
+    """.split()
+)
+
+# Words are runs of letters/digits/+#& optionally joined by "/" or "." ("ci/cd",
+# "node.js"); hyphens split words, so "e-commerce" is the two-word phrase "e commerce".
+_WORD_RE = re.compile(r"[a-z0-9+#&]+(?:[/.][a-z0-9+#&]+)*")
+_TITLE_LINE_RE = re.compile(r"^\s*(?:#+\s*|(?:job\s+)?title\s*:\s*|role\s*:\s*)(.{4,90})$", re.IGNORECASE | re.MULTILINE)
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.{12,200})$", re.MULTILINE)
+_MARKDOWN_RE = re.compile(r"[*_`>#\[\]()]")
+
+
+class _PhraseIndex:
+    """All phrase vocabularies indexed by their first word.
+
+    Scanning a posting is one dict lookup per word; only words that start a
+    known phrase go on to compare the (few) candidate phrases.
+    """
+
+    def __init__(self, vocabs: Dict[str, Dict[str, List[str]]]):
+        self.order = {
+            (field, name): i
+            for field, vocab in vocabs.items()
+            for i, name in enumerate(vocab)
+        }
+        self.by_first: Dict[str, List[Tuple[Tuple[str, ...], str, str]]] = {}
+        for field, vocab in vocabs.items():
+            for name, forms in vocab.items():
+                for form in forms:
+                    words = tuple(_WORD_RE.findall(form))
+                    self.by_first.setdefault(words[0], []).append((words[1:], field, name))
+
+    def scan(self, words: List[str]) -> Dict[str, List[str]]:
+        by_first = self.by_first
+        hits = set()
+        for i, word in enumerate(words):
+            candidates = by_first.get(word)
+            if not candidates:
+                continue
+            for rest, field, name in candidates:
+                if not rest or tuple(words[i + 1 : i + 1 + len(rest)]) == rest:
+                    hits.add((field, name))
+        out: Dict[str, List[str]] = {}
+        for field, name in sorted(hits, key=self.order.__getitem__):
+            out.setdefault(field, []).append(name)
+        return out
+
+
+_PHRASES = _PhraseIndex({
+    "skills": _SKILLS,
+    "tools": _TOOLS,
+    "domains": _DOMAINS,
+    "industries": _INDUSTRIES,
+    "location_type": _LOCATION_TYPES,
+})
+_FAMILY_PATTERNS = [(name, re.compile(p, re.IGNORECASE)) for name, p in _ROLE_FAMILIES]
+_SENIORITY_PATTERNS = [(name, re.compile(p, re.IGNORECASE)) for name, p in _SENIORITY]
+
+
+def _first_match(patterns: Iterable[Tuple[str, Pattern[str]]], text: str) -> Optional[str]:
+    for name, pattern in patterns:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def _guess_title(text: str) -> str:
+    m = _TITLE_LINE_RE.search(text)
+    if not m:
+        return ""
+    return _MARKDOWN_RE.sub("", m.group(1)).strip()
+
+
+def _responsibilities(text: str, limit: int = 6) -> List[str]:
+    out: List[str] = []
+    for m in _BULLET_RE.finditer(text):
+        line = _MARKDOWN_RE.sub("", m.group(1)).strip().lower().rstrip(".;")
+        if line.split(" ", 1)[0] in _RESPONSIBILITY_VERBS and line not in out:
+            out.append(line)
+            if len(out) >= limit:
+                break
+    return out
+
+
+def _keywords(words: List[str], exclude: Iterable[str], limit: int = 15) -> List[str]:
+    skip = _STOPWORDS.union(exclude)
+    counts = Counter(w for w in words if len(w) > 2 and not w.isdigit())
+    ranked = [w for w, n in counts.most_common() if n > 1 and w not in skip]
+    return ranked[:limit]
+
+
+def extract_local_fingerprint(job_text: str, title: Optional[str] = None) -> Dict[str, Any]:
+    """Deterministic fingerprint from the markdown body (and optional front-matter role)."""
+    text = job_text or ""
+    words = _WORD_RE.findall(text.lower())
+    role_title = (title or "").strip() or _guess_title(text)
+    head = f"{role_title}\n{text[:400]}"
+
+    found = _PHRASES.scan(words)
+    skills = found.get("skills", [])
+    tools = found.get("tools", [])
+    domains = found.get("domains", [])
+    location_types = found.get("location_type", [])
+
+    return {
+        "role_title": role_title.lower(),
+        "role_family": _first_match(_FAMILY_PATTERNS, role_title) or _first_match(_FAMILY_PATTERNS, head) or "",
+        "seniority": _first_match(_SENIORITY_PATTERNS, role_title) or "unknown",
+        "industries": found.get("industries", []),
+        "domains": domains,
+        "skills": skills,
+        "tools": tools,
+        "responsibilities": _responsibilities(text),
+        "keywords": _keywords(words, exclude=skills + tools + domains),
+        "location_type": location_types[0] if location_types else "unknown",
+        "fingerprint_source": LOCAL_SOURCE,
+    }
+
+
+def is_local_fingerprint(fingerprint: Optional[Dict[str, Any]]) -> bool:
+    """True when a stored fingerprint came from the rule-based extractor (upgrade candidate)."""
+    return bool(fingerprint) and fingerprint.get("fingerprint_source") == LOCAL_SOURCE
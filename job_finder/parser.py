@@ -6,6 +6,9 @@ from typing import Any, Dict, Tuple
 
 import yaml
 
+# libyaml's loader parses front matter several times faster when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class ParsedJob:
@@ -24,12 +27,18 @@ def parse_front_matter(text: str) -> ParsedJob:
 
     raw_meta = text[4:end].strip()
     body = text[end + 4 :].strip()
-    meta = yaml.safe_load(raw_meta) or {}
+    meta = yaml.load(raw_meta, Loader=_YAML_LOADER) or {}
     if not isinstance(meta, dict):
         meta = {}
     return ParsedJob(meta=meta, body=body)
 
 
+def render_front_matter(meta: Dict[str, Any], body: str) -> str:
+    """Inverse of parse_front_matter: YAML front matter block followed by body."""
+    raw_meta = yaml.safe_dump(meta, sort_keys=False, allow_unicode=True, width=1000)
+    return f"---\n{raw_meta}---\n\n{body}"
+
+
 def parse_job_file(path: Path) -> ParsedJob:
     text = path.read_text(encoding="utf-8")
     return parse_front_matter(text)
@@ -0,0 +1,343 @@
+"""
+Streaming scrape → save → fingerprint → score pipeline.
+
+Each stage runs in its own thread and hands jobs to the next through a bounded
+queue, so a scraped job is saved, fingerprinted and scored while the scraper is
+still working on the rest. A slow stage (usually fingerprinting) fills its
+input queue and the stages before it block on put() instead of piling work up
+in memory.
+"""
+from __future__ import annotations
+
+import heapq
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .claude import AnyClaudeClient, claude_fingerprints
+from .config import get_inbox_dir
+from .identity import claim_jobs
+from .local_fingerprint import extract_local_fingerprint
+from .profile import InterestProfile
+from .scoring import score_against_liked
+from .scraper import TermYield, iter_similar_jobs, save_jobs_to_db, save_jobs_to_inbox, scraped_job_id
+from .storage import insert_new_jobs, stored_job_ids, update_fingerprints
+from .term_planner import DEFAULT_REQUEST_BUDGET, HIGH_SCORE, plan_search_terms, record_term_yields
+
+DEFAULT_QUEUE_SIZE = 16
+DEFAULT_FINGERPRINT_BATCH = 8
+# How long the fingerprint stage waits to fill a batch before sending a partial one.
+BATCH_WAIT = 1.0
+
+_DONE = object()
+
+
+@dataclass
+class PipelineMatch:
+    score: float
+    job_id: str
+    company: str
+    role: str
+    url: str
+    source: str
+
+
+@dataclass
+class PipelineProgress:
+    scraped: int = 0
+    saved: int = 0
+    fingerprinted: int = 0
+    scored: int = 0
+    message: str = ""
+    top: List[PipelineMatch] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    done: bool = False
+
+
+class _Pipeline:
+    def __init__(
+        self,
+        liked_fps: List[Dict],
+        client: Optional[AnyClaudeClient],
+        profile: Optional[InterestProfile],
+        top_n: int,
+        queue_size: int,
+        fingerprint_batch: int,
+        write_markdown: bool = False,
+    ):
+        self.liked_fps = liked_fps
+        self.write_markdown = write_markdown
+        self.client = client
+        self.profile = profile
+        self.top_n = top_n
+        self.fingerprint_batch = max(fingerprint_batch, 1)
+        self.to_save: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.to_fingerprint: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.to_score: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.progress = PipelineProgress()
+        self._top: List[Tuple[float, int, PipelineMatch]] = []
+        self._counter = 0
+        self.term_yields: Dict[str, TermYield] = {}
+
+    # ── plumbing ──
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, timeout: Optional[float] = None) -> Any:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while not self.stop.is_set():
+            wait = 0.2 if deadline is None else min(0.2, deadline - time.monotonic())
+            if wait <= 0:
+                raise queue.Empty
+            try:
+                return q.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, stage: str, exc: BaseException) -> None:
+        with self.lock:
+            self.progress.errors.append(f"{stage}: {exc}")
+
+    def _bump(self, counter: str, n: int = 1) -> None:
+        with self.lock:
+            setattr(self.progress, counter, getattr(self.progress, counter) + n)
+
+    def _job_id(self, job: Dict) -> str:
+        """The jobs.db id the save stage gives a scraped job, with or without a markdown file."""
+        return scraped_job_id(job)
+
+    # ── stages ──
+
+    def scrape(self, fingerprints: List[Dict], scrape_kwargs: Dict[str, Any]) -> None:
+        def _on_progress(step: int, total: int, msg: str) -> None:
+            with self.lock:
+                self.progress.message = msg
+
+        try:
+            jobs = iter_similar_jobs(
+                fingerprints, on_progress=_on_progress, term_yields=self.term_yields, **scrape_kwargs
+            )
+            for job in jobs:
+                self._bump("scraped")
+                if not self._put(self.to_save, job):
+                    break
+        except Exception as exc:
+            self._fail("scrape", exc)
+        finally:
+            self._put(self.to_save, _DONE)
+
+    def save(self) -> None:
+        inbox = get_inbox_dir()
+        try:
+            finished = False
+            while not finished:
+                first = self._get(self.to_save)
+                if first is _DONE:
+                    break
+                # Whatever else is already waiting goes into the same transaction.
+                batch = [first]
+                while len(batch) < self.to_save.maxsize:
+                    try:
+                        item = self.to_save.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                # Drop postings already stored under another source or name, and
+                # re-scrapes of stored ones, whose rows (bucket, liked, fingerprint) stay as they are.
+                duplicates = claim_jobs([(self._job_id(job), job) for job in batch], source="scrape")
+                stored = stored_job_ids(self._job_id(job) for job in batch)
+                batch = [job for job in batch if self._job_id(job) not in duplicates and self._job_id(job) not in stored]
+                if not batch:
+                    continue
+
+                if self.write_markdown:
+                    paths = save_jobs_to_inbox(batch, inbox)
+                    ids = [self._job_id(job) for job in batch]
+                else:
+                    paths = [None] * len(batch)
+                    ids = save_jobs_to_db(batch)
+
+                records = []
+                for job, path, job_id in zip(batch, paths, ids):
+                    records.append({
+                        "job_id": job_id,
+                        "path": str(path) if path else None,
+                        "bucket": "inbox",
+                        "liked": 0,
+                        "company": job["company"],
+                        "role": job["title"],
+                        "location": job.get("location"),
+                        "source": f"{job.get('source', 'scraped')} ({job.get('url', '')})",
+                        "date_saved": time.strftime("%Y-%m-%d", time.gmtime()),
+                        "body": job["description"],
+                        "url": job.get("url", ""),
+                        "scrape_source": job.get("source", ""),
+                        "search_term": job.get("search_term", ""),
+                    })
+                if self.write_markdown:
+                    # Rows go in without a fingerprint; the fingerprint stage fills it in.
+                    insert_new_jobs(records)
+                self._bump("saved", len(records))
+                for record in records:
+                    if not self._put(self.to_fingerprint, record):
+                        return
+        except Exception as exc:
+            self._fail("save", exc)
+        finally:
+            self._put(self.to_fingerprint, _DONE)
+
+    def fingerprint(self) -> None:
+        try:
+            finished = False
+            while not finished:
+                first = self._get(self.to_fingerprint)
+                if first is _DONE:
+                    break
+                batch = [first]
+                # Give the scraper a moment to deliver more so Claude calls can be packed.
+                while len(batch) < self.fingerprint_batch:
+                    try:
+                        item = self._get(self.to_fingerprint, timeout=BATCH_WAIT)
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                by_id = {record["job_id"]: record for record in batch}
+                fingerprints: Dict[str, Dict[str, Any]] = {}
+                if self.client:
+                    try:
+                        fingerprints = claude_fingerprints(
+                            self.client, {job_id: r["body"] for job_id, r in by_id.items()}
+                        )
+                    except Exception as exc:
+                        self._fail("fingerprint", exc)
+                for job_id, record in by_id.items():
+                    fp = fingerprints.get(job_id) or extract_local_fingerprint(record["body"], title=record["role"])
+                    record["fingerprint"] = fp
+                # The save stage already wrote the rows; only the fingerprint changes.
+                update_fingerprints({job_id: record["fingerprint"] for job_id, record in by_id.items()})
+                self._bump("fingerprinted", len(by_id))
+                for record in by_id.values():
+                    if not self._put(self.to_score, record):
+                        return
+        except Exception as exc:
+            self._fail("fingerprint", exc)
+        finally:
+            self._put(self.to_score, _DONE)
+
+    def score(self) -> None:
+        try:
+            while True:
+                record = self._get(self.to_score)
+                if record is _DONE:
+                    break
+                value = score_against_liked(record["fingerprint"], self.liked_fps, self.profile)
+                match = PipelineMatch(
+                    score=value,
+                    job_id=record["job_id"],
+                    company=record["company"],
+                    role=record["role"],
+                    url=record["url"],
+                    source=record["scrape_source"],
+                )
+                with self.lock:
+                    term_yield = self.term_yields.get(record["search_term"])
+                    if term_yield and value >= HIGH_SCORE:
+                        term_yield.high_score += 1
+                    self._counter += 1
+                    # Ties keep the earlier arrival.
+                    entry = (value, -self._counter, match)
+                    if len(self._top) < self.top_n:
+                        heapq.heappush(self._top, entry)
+                    else:
+                        heapq.heappushpop(self._top, entry)
+                    self.progress.scored += 1
+        except Exception as exc:
+            self._fail("score", exc)
+
+    def snapshot(self, done: bool = False) -> PipelineProgress:
+        with self.lock:
+            p = self.progress
+            return PipelineProgress(
+                scraped=p.scraped,
+                saved=p.saved,
+                fingerprinted=p.fingerprinted,
+                scored=p.scored,
+                message=p.message,
+                top=[m for _, _, m in sorted(self._top, reverse=True)],
+                errors=list(p.errors),
+                done=done,
+            )
+
+
+def run_pipeline(
+    liked_fps: List[Dict],
+    client: Optional[AnyClaudeClient] = None,
+    profile: Optional[InterestProfile] = None,
+    top_n: int = 10,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    fingerprint_batch: int = DEFAULT_FINGERPRINT_BATCH,
+    refresh: float = 0.5,
+    request_budget: Optional[int] = DEFAULT_REQUEST_BUDGET,
+    write_markdown: bool = False,
+    **scrape_kwargs: Any,
+) -> Iterator[PipelineProgress]:
+    """
+    Scrape jobs similar to liked_fps and stream them through save, fingerprint
+    (Claude when a client is given, otherwise local) and scoring.
+
+    Yields a PipelineProgress snapshot every `refresh` seconds with stage
+    counts and the current top_n matches; the last one has done=True.
+    scrape_kwargs go to iter_similar_jobs (location, results_per_term, …).
+    With a request_budget, search terms come from the yield-based planner
+    and each term's yield is recorded when the run finishes. Jobs are
+    stored in jobs.db only unless write_markdown also asks for inbox files.
+    Stopping iteration early shuts the stages down.
+    """
+    pipe = _Pipeline(liked_fps, client, profile, top_n, queue_size, fingerprint_batch, write_markdown)
+    parents: Dict[str, str] = {}
+    if request_budget and "search_terms" not in scrape_kwargs:
+        plan = plan_search_terms(
+            liked_fps,
+            request_budget=request_budget,
+            results_per_term=scrape_kwargs.get("results_per_term", 15),
+            sources=scrape_kwargs.get("sources"),
+        )
+        scrape_kwargs["search_terms"] = plan.terms
+        parents = plan.parents
+    threads = [
+        threading.Thread(target=pipe.scrape, args=(liked_fps, scrape_kwargs), name="pipeline-scrape", daemon=True),
+        threading.Thread(target=pipe.save, name="pipeline-save", daemon=True),
+        threading.Thread(target=pipe.fingerprint, name="pipeline-fingerprint", daemon=True),
+        threading.Thread(target=pipe.score, name="pipeline-score", daemon=True),
+    ]
+    for t in threads:
+        t.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            threads[-1].join(refresh)
+            yield pipe.snapshot()
+        record_term_yields(pipe.term_yields, parents)
+        yield pipe.snapshot(done=True)
+    finally:
+        pipe.stop.set()
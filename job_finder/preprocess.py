@@ -0,0 +1,266 @@
+"""
+Job description preprocessing before it is sent to Claude.
+
+Scraped postings carry EEO statements, benefits lists and legal footers that
+cost input tokens without changing the fingerprint or the tailored docs.
+compress_job_text drops those paragraphs (by pattern and by a learned set of
+paragraph hashes that repeat across the corpus), collapses whitespace and caps
+the length by section priority.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import get_data_dir
+
+DEFAULT_MAX_CHARS = 6000
+# Paragraphs seen in this many distinct postings are treated as boilerplate.
+MIN_REPEAT_DOCS = 3
+# Keep the learned store bounded; singletons are pruned first.
+MAX_TRACKED_PARAGRAPHS = 50000
+# Posting hashes remembered to avoid counting one posting twice; oldest go first.
+MAX_TRACKED_DOCS = 20000
+# A posting whose paragraphs are mostly "learned boilerplate" is a repost of
+# something already seen, not boilerplate; its learned matches are kept.
+MAX_LEARNED_SHARE = 0.5
+# Learned counts only cover paragraphs longer than this.
+MIN_LEARNED_CHARS = 40
+
+_BOILERPLATE_RE = re.compile(
+    r"equal (?:employment )?opportunity|without regard to|reasonable accommodation"
+    r"|protected veteran|e-verify|pay transparency|criminal histor|privacy (?:notice|policy)"
+    r"|affirmative action|drug[- ]free workplace|we are an equal|eeo\b|all qualified applicants"
+    r"|do not accept unsolicited|recruitment (?:fraud|scam)|by applying,? you",
+    re.IGNORECASE,
+)
+
+_HEADING_RE = re.compile(r"^\s*(#{1,6}\s*)?(\*\*)?([A-Za-z][^:\n]{2,60}?)\**\s*(:)?\s*$")
+
+# (priority, pattern) — lower number is kept first when the length cap bites.
+# Priority None means the whole section is dropped. The first match wins, so
+# the drop patterns sit above the generic ones ("Company Benefits", "Benefits
+# Overview" and "Bonus & Perks" are dropped, not kept).
+_SECTION_PRIORITY: List[Tuple[Optional[int], re.Pattern]] = [
+    (0, re.compile(r"responsibilit|what you(?:'|’)?ll do|duties|the role|role overview|your impact|day to day", re.I)),
+    (0, re.compile(r"requirement|qualification|what you(?:'|’)?ll (?:need|bring)|must have|skills|experience|who you are", re.I)),
+    (None, re.compile(r"benefit|perks|what we offer|compensation|salary|pay range|total rewards", re.I)),
+    (None, re.compile(r"equal opportunity|eeo|diversity|accommodation|legal|disclaimer|privacy", re.I)),
+    (1, re.compile(r"preferred|nice to have|bonus|plus", re.I)),
+    (2, re.compile(r"about (?:the )?(?:job|position|opportunity)|summary|overview", re.I)),
+    (3, re.compile(r"about (?:us|the company|the team)|who we are|our (?:mission|culture|story)|company", re.I)),
+]
+_DEFAULT_PRIORITY = 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for savings reports."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class CompressedText:
+    text: str
+    original_tokens: int
+    compressed_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.original_tokens - self.compressed_tokens, 0)
+
+
+# ── Learned boilerplate ───────────────────────────────────────────────────────
+
+def _boilerplate_path() -> Path:
+    return get_data_dir() / "boilerplate.json"
+
+
+def _normalize_paragraph(paragraph: str) -> str:
+    return re.sub(r"[^a-z]+", " ", paragraph.lower()).strip()
+
+
+def paragraph_hash(paragraph: str) -> str:
+    return hashlib.sha1(_normalize_paragraph(paragraph).encode("utf-8")).hexdigest()[:16]
+
+
+def _split_blocks(text: str) -> Tuple[List[str], str]:
+    text = text.replace("\r\n", "\n")
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) < 3 and text.count("\n") > 5:
+        return [line.strip() for line in text.split("\n") if line.strip()], "\n"
+    return paragraphs, "\n\n"
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Split on blank lines. Scraped descriptions (get_text(separator="\n")) have
+    none, so fall back to one paragraph per line for those.
+    """
+    return _split_blocks(text)[0]
+
+
+class BoilerplateModel:
+    """Paragraph-hash document frequencies learned from ingested postings."""
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None, docs: Optional[Iterable[str]] = None):
+        self.counts: Dict[str, int] = dict(counts or {})
+        # Insertion-ordered, so pruning drops the postings learned longest ago.
+        self.docs: Dict[str, None] = dict.fromkeys(docs or [])
+
+    def learn(self, bodies: Iterable[str]) -> int:
+        """Count each paragraph once per unseen posting. Returns postings added."""
+        added = 0
+        for body in bodies:
+            doc_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+            if doc_hash in self.docs:
+                continue
+            self.docs[doc_hash] = None
+            added += 1
+            for h in {paragraph_hash(p) for p in split_paragraphs(body) if len(p) > MIN_LEARNED_CHARS}:
+                self.counts[h] = self.counts.get(h, 0) + 1
+        if len(self.counts) > MAX_TRACKED_PARAGRAPHS:
+            self.counts = {h: n for h, n in self.counts.items() if n > 1}
+        if len(self.docs) > MAX_TRACKED_DOCS:
+            self.docs = dict.fromkeys(list(self.docs)[-MAX_TRACKED_DOCS:])
+        return added
+
+    def is_boilerplate(self, paragraph: str) -> bool:
+        return self.counts.get(paragraph_hash(paragraph), 0) >= MIN_REPEAT_DOCS
+
+    def to_dict(self) -> Dict:
+        return {"counts": self.counts, "docs": list(self.docs)}
+
+
+_MODEL_CACHE: Dict[str, BoilerplateModel] = {}
+
+
+def load_boilerplate_model() -> BoilerplateModel:
+    path = _boilerplate_path()
+    cached = _MODEL_CACHE.get(str(path))
+    if cached is not None:
+        return cached
+    model = BoilerplateModel()
+    if path.exists():
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            model = BoilerplateModel(data.get("counts"), data.get("docs"))
+        except (json.JSONDecodeError, AttributeError):
+            pass
+    _MODEL_CACHE[str(path)] = model
+    return model
+
+
+def learn_boilerplate(bodies: Iterable[str]) -> BoilerplateModel:
+    """Fold new postings into the persisted boilerplate model."""
+    model = load_boilerplate_model()
+    if model.learn(bodies):
+        path = _boilerplate_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(model.to_dict()), encoding="utf-8")
+    return model
+
+
+# ── Compression ───────────────────────────────────────────────────────────────
+
+def _collapse_whitespace(paragraph: str) -> str:
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in paragraph.split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def _section_priority(heading: str) -> Optional[int]:
+    for priority, pattern in _SECTION_PRIORITY:
+        if pattern.search(heading):
+            return priority
+    return _DEFAULT_PRIORITY
+
+
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•▪◦·]|\d+[.)])\s+")
+# Unbulleted lines this short (scraped lists lose their markers) read as list items.
+_SHORT_ITEM_WORDS = 12
+
+
+def _is_list_block(paragraph: str) -> bool:
+    lines = [line for line in paragraph.split("\n") if line.strip()]
+    return bool(lines) and all(_LIST_ITEM_RE.match(line) or len(line.split()) <= _SHORT_ITEM_WORDS for line in lines)
+
+
+def _heading_of(paragraph: str) -> Optional[str]:
+    """Return the heading text if the paragraph opens with a section heading."""
+    first_line = paragraph.split("\n", 1)[0]
+    m = _HEADING_RE.match(first_line)
+    if not m or len(first_line.split()) > 8:
+        return None
+    marked = m.group(1) or m.group(2) or m.group(4)
+    heading = m.group(3)
+    # Bare short lines ("Dental", "Chicago, IL") only count if they name a known section.
+    if not marked and not any(p.search(heading) for _, p in _SECTION_PRIORITY):
+        return None
+    return heading
+
+
+def compress_job_text(
+    text: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    model: Optional[BoilerplateModel] = None,
+) -> CompressedText:
+    """
+    Strip boilerplate paragraphs, collapse whitespace and cap length.
+
+    When the remaining text is longer than max_chars, paragraphs are kept by
+    section priority (responsibilities/requirements first, company blurb last)
+    and re-emitted in their original order.
+    """
+    original = text or ""
+    model = model if model is not None else load_boilerplate_model()
+
+    paragraphs, separator = _split_blocks(original)
+    learned = [len(p) > MIN_LEARNED_CHARS and model.is_boilerplate(p) for p in paragraphs]
+    long_paragraphs = sum(len(p) > MIN_LEARNED_CHARS for p in paragraphs)
+    if long_paragraphs and sum(learned) > long_paragraphs * MAX_LEARNED_SHARE:
+        learned = [False] * len(paragraphs)
+
+    kept: List[Tuple[int, int, str]] = []  # (priority, position, paragraph)
+    priority: Optional[int] = _DEFAULT_PRIORITY
+    dropped_body = False
+    for position, paragraph in enumerate(paragraphs):
+        heading = _heading_of(paragraph)
+        if heading:
+            priority = _section_priority(heading)
+            # A heading with its body in the same block is a whole section.
+            dropped_body = "\n" in paragraph and separator != "\n"
+        elif priority is None:
+            # A dropped section runs over its first body block and any list
+            # blocks after it; the next prose block starts unlabelled content.
+            if dropped_body and not _is_list_block(paragraph):
+                priority = _DEFAULT_PRIORITY
+            dropped_body = True
+        if priority is None:
+            continue
+        if _BOILERPLATE_RE.search(paragraph) or learned[position]:
+            continue
+        kept.append((priority, position, _collapse_whitespace(paragraph)))
+
+    budget = max_chars
+    selected: List[Tuple[int, str]] = []
+    for prio, position, paragraph in sorted(kept):
+        cost = len(paragraph) + len(separator)
+        if cost > budget:
+            if not selected:
+                selected.append((position, paragraph[:budget]))
+            continue
+        selected.append((position, paragraph))
+        budget -= cost
+
+    compressed = separator.join(p for _, p in sorted(selected))
+    if not compressed:
+        # Everything looked like boilerplate — better to send something than nothing.
+        compressed = _collapse_whitespace(original)[:max_chars]
+    return CompressedText(
+        text=compressed,
+        original_tokens=estimate_tokens(original),
+        compressed_tokens=estimate_tokens(compressed),
+    )
@@ -23,6 +23,9 @@ class InterestProfile:
     alert_sources: List[str] = field(default_factory=list)
     alert_email_to: Optional[str] = None
     alert_email_enabled: bool = False
+    # Poll interval for the alert daemon; alert_feed_intervals overrides it per feed URL.
+    alert_interval_minutes: int = 60
+    alert_feed_intervals: Dict[str, int] = field(default_factory=dict)
 
 
 def load_profile() -> InterestProfile:
@@ -41,6 +44,10 @@ def load_profile() -> InterestProfile:
         alert_sources=_to_list(data.get("alert_sources")),
         alert_email_to=data.get("alert_email_to"),
         alert_email_enabled=bool(data.get("alert_email_enabled")),
+        alert_interval_minutes=int(data.get("alert_interval_minutes") or 60),
+        alert_feed_intervals={
+            str(url): int(minutes) for url, minutes in (data.get("alert_feed_intervals") or {}).items() if minutes
+        },
     )
 
 
@@ -70,4 +77,6 @@ def _as_dict(profile: InterestProfile) -> Dict:
         "alert_sources": profile.alert_sources,
         "alert_email_to": profile.alert_email_to,
         "alert_email_enabled": profile.alert_email_enabled,
+        "alert_interval_minutes": profile.alert_interval_minutes,
+        "alert_feed_intervals": profile.alert_feed_intervals,
     }
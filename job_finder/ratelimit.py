@@ -0,0 +1,112 @@
+"""
+Per-host token buckets with adaptive pacing for the scraper.
+
+Each host gets its own bucket. Healthy responses nudge the rate up
+(additive increase); throttling responses (429, LinkedIn's 999, 5xx) halve it
+and pause the host for a cool-down (multiplicative decrease), so a small pool
+of workers can go as fast as the site tolerates and no faster.
+retry_after_seconds reads a Retry-After header for the scraper and the
+Claude clients alike.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+THROTTLE_STATUSES = frozenset({429, 999})
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None if absent or unparseable."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass
+class _Bucket:
+    rate: float
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+    paused_until: float = 0.0
+    throttled: int = 0
+
+
+class HostRateLimiter:
+    """Thread-safe AIMD rate limiter keyed by URL host."""
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: float = 2.0,
+        min_rate: float = 0.1,
+        max_rate: float = 4.0,
+        increase: float = 0.1,
+        cooldown: float = 10.0,
+    ):
+        self.initial_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.cooldown = cooldown
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _Bucket(rate=self.initial_rate, tokens=min(1.0, self.burst))
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Block until a request to url's host is allowed. False if should_stop() fired while waiting."""
+        host = urlsplit(url).netloc
+        while True:
+            if should_stop and should_stop():
+                return False
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+                if now >= bucket.paused_until and bucket.tokens >= 1.0:
+                    bucket.tokens -= 1.0
+                    return True
+                wait = max(bucket.paused_until - now, (1.0 - bucket.tokens) / bucket.rate)
+            time.sleep(min(wait, 1.0))
+
+    def record(self, url: str, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Feed a response status back into the host's pacing. None means a network error."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            if status is None or status in THROTTLE_STATUSES or status >= 500:
+                bucket.throttled += 1
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                pause = retry_after if retry_after is not None else self.cooldown * min(bucket.throttled, 6)
+                bucket.paused_until = max(bucket.paused_until, time.monotonic() + pause)
+                bucket.tokens = 0.0
+            elif status < 400:
+                bucket.throttled = 0
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def rate(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(urlsplit(url).netloc).rate
@@ -0,0 +1,254 @@
+"""
+Recorded fixtures and a local stub server for exercising the scraper offline.
+
+Record: set JOB_FINDER_SCRAPER_RECORD=<dir> and every page the scraper fetches
+(search, detail, rss) is written there with an index.json describing it.
+
+Replay: StubServer serves a fixture directory over HTTP with configurable
+latency, random errors and periodic 429 bursts. Point the scraper at it with
+JOB_FINDER_LINKEDIN_BASE / JOB_FINDER_INDEED_BASE.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+RECORD_ENV = "JOB_FINDER_SCRAPER_RECORD"
+SEARCH_PATH = "/jobs-guest/jobs/api/seeMoreJobPostings/search"
+DETAIL_PATH = "/jobs-guest/jobs/api/jobPosting/"
+
+
+def fixture_key(kind: str, url: str) -> str:
+    """Lookup key for a request: search by keywords + offset, detail by job ID, rss by query."""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    if kind == "search":
+        return f"{query.get('keywords', [''])[0].lower()}|{query.get('start', ['0'])[0]}"
+    if kind == "detail":
+        return parts.path.rstrip("/").rsplit("/", 1)[-1]
+    return f"{query.get('q', [''])[0].lower()}|{query.get('l', [''])[0].lower()}"
+
+
+# ── Record ────────────────────────────────────────────────────────────────────
+
+class FixtureRecorder:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._index_path = self.root / "index.json"
+        self._index: List[Dict] = []
+        if self._index_path.exists():
+            self._index = json.loads(self._index_path.read_text(encoding="utf-8"))
+
+    def record(self, kind: str, url: str, body: str) -> None:
+        key = fixture_key(kind, url)
+        name = f"{kind}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}.html"
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            (self.root / name).write_text(body, encoding="utf-8")
+            self._index = [e for e in self._index if (e["kind"], e["key"]) != (kind, key)]
+            self._index.append({"kind": kind, "key": key, "url": url, "file": name})
+            self._index_path.write_text(json.dumps(self._index, indent=2), encoding="utf-8")
+
+
+_RECORDERS: Dict[str, FixtureRecorder] = {}
+
+
+def get_recorder() -> Optional[FixtureRecorder]:
+    """Recorder for the directory in JOB_FINDER_SCRAPER_RECORD, if set."""
+    root = os.environ.get(RECORD_ENV)
+    if not root:
+        return None
+    recorder = _RECORDERS.get(root)
+    if recorder is None:
+        recorder = FixtureRecorder(Path(root))
+        _RECORDERS[root] = recorder
+    return recorder
+
+
+# ── Synthetic fixtures ────────────────────────────────────────────────────────
+
+def synthesize_fixtures(root: Path, pages: int = 4, cards_per_page: int = 25, keywords: str = "data engineer") -> Path:
+    """Write a fixture set shaped like LinkedIn's guest API (for when nothing has been recorded)."""
+    recorder = FixtureRecorder(root)
+    for page in range(pages):
+        start = page * cards_per_page
+        cards = "".join(
+            f'<li><div class="base-card"><a class="base-card__full-link" '
+            f'href="https://www.linkedin.com/jobs/view/role-{3900000000 + i}"></a>'
+            f'<h3 class="base-search-card__title">Data Engineer {i}</h3>'
+            f'<h4 class="base-search-card__subtitle">Company {i % 37}</h4>'
+            f'<span class="job-search-card__location">Remote</span></div></li>'
+            for i in range(start, start + cards_per_page)
+        )
+        url = f"https://www.linkedin.com{SEARCH_PATH}?keywords={keywords}&start={start}"
+        recorder.record("search", url, f"<ul>{cards}</ul>")
+    paragraphs = "".join(f"<p>Build pipelines with Python, SQL and Airflow ({i}).</p>" for i in range(20))
+    recorder.record(
+        "detail",
+        f"https://www.linkedin.com{DETAIL_PATH}0",
+        f'<section class="description"><div class="show-more-less-html__markup">{paragraphs}</div></section>',
+    )
+    return Path(root)
+
+
+# ── Replay ────────────────────────────────────────────────────────────────────
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    served: int = 0
+    errors: int = 0
+    throttled: int = 0
+    by_kind: Dict[str, int] = field(default_factory=dict)
+    timestamps: List[float] = field(default_factory=list)
+
+
+class StubServer:
+    """
+    Replays a fixture directory on 127.0.0.1.
+
+    latency: seconds added to every response. error_rate: fraction of requests
+    answered 500. burst_every / burst_len: after every burst_every requests,
+    the next burst_len get 429 with Retry-After: retry_after.
+    """
+
+    def __init__(
+        self,
+        fixtures: Path,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        burst_every: int = 0,
+        burst_len: int = 0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        self.fixtures = Path(fixtures)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_len = burst_len
+        self.retry_after = retry_after
+        self.stats = StubStats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], str] = {}
+        self._by_kind: Dict[str, List[str]] = {}
+        index = json.loads((self.fixtures / "index.json").read_text(encoding="utf-8"))
+        for entry in index:
+            self._entries[(entry["kind"], entry["key"])] = entry["file"]
+            self._by_kind.setdefault(entry["kind"], []).append(entry["file"])
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 (http.server API)
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _classify(self, path: str) -> str:
+        if path.startswith(SEARCH_PATH):
+            return "search"
+        if path.startswith(DETAIL_PATH):
+            return "detail"
+        if path.startswith("/rss"):
+            return "rss"
+        return "page"
+
+    def _lookup(self, kind: str, url: str) -> Optional[str]:
+        key = fixture_key(kind, url)
+        name = self._entries.get((kind, key))
+        if name is None and kind == "search":
+            # Other keywords: serve whichever recorded page sits at the same offset.
+            offset = key.rsplit("|", 1)[-1]
+            name = next((f for (k, fk), f in self._entries.items() if k == "search" and fk.endswith(f"|{offset}")), None)
+            if name is None:
+                return "<ul></ul>"
+        if name is None and self._by_kind.get(kind):
+            candidates = self._by_kind[kind]
+            name = candidates[int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16) % len(candidates)]
+        if name is None:
+            return None
+        return (self.fixtures / name).read_text(encoding="utf-8")
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        kind = self._classify(handler.path)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_kind[kind] = self.stats.by_kind.get(kind, 0) + 1
+            self.stats.timestamps.append(time.monotonic())
+            n = self.stats.requests
+            in_burst = bool(self.burst_every and self.burst_len) and ((n - 1) % (self.burst_every + self.burst_len)) >= self.burst_every
+            failed = not in_burst and self._random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+
+        if in_burst:
+            with self._lock:
+                self.stats.throttled += 1
+            self._send(handler, 429, "", {"Retry-After": str(self.retry_after)})
+            return
+        if failed:
+            with self._lock:
+                self.stats.errors += 1
+            self._send(handler, 500, "")
+            return
+        if kind == "page":
+            self._send(handler, 200, "<html></html>", {"Set-Cookie": "bcookie=stub; Path=/; Max-Age=86400"})
+            return
+        body = self._lookup(kind, handler.path)
+        if body is None:
+            self._send(handler, 404, "")
+            return
+        with self._lock:
+            self.stats.served += 1
+        self._send(handler, 200, body)
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, body: str, headers: Optional[Dict[str, str]] = None) -> None:
+        data = body.encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "text/html; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
@@ -1,19 +1,45 @@
 """
-Job scraper — LinkedIn (primary) + Indeed RSS (fallback).
+Job scraper — LinkedIn, Indeed RSS and the profile's alert feeds, each behind a
+JobSource adapter and searched concurrently.
 Uses a warmed-up requests.Session so LinkedIn doesn't block cold requests.
-No API key, no C extensions — just requests, bs4, feedparser.
+Description pages are fetched by a small worker pool, paced per host by an
+adaptive token bucket (see ratelimit.py).
+No API key, no C extensions — just requests, bs4, feedparser (lxml is used
+as the HTML parser when it happens to be installed).
 """
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import math
+import os
+import queue
 import re
+import threading
 import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
 
-from .parser import slugify
+from .config import get_data_dir
+from .http_cache import DEFAULT_TTLS, HttpCache, get_http_cache
+from .identity import SOURCE_URL_RE, RunClaims, extract_job_id_from_href, posting_key
+from .parser import render_front_matter, slugify
+from .ratelimit import THROTTLE_STATUSES, HostRateLimiter, retry_after_seconds
+from .scrape_fixtures import get_recorder
+from .storage import insert_new_jobs, known_posting_keys, list_job_sources, record_known_postings
+
+logger = logging.getLogger(__name__)
 
 # ── Browser headers ───────────────────────────────────────────────────────────
 
@@ -30,10 +56,160 @@ _BASE_HEADERS = {
     "Connection": "keep-alive",
 }
 
+# Overridable so the scraper can be pointed at a local stub server (see scrape_fixtures.py).
+LINKEDIN_BASE_ENV = "JOB_FINDER_LINKEDIN_BASE"
+INDEED_BASE_ENV = "JOB_FINDER_INDEED_BASE"
+
+
+def _linkedin_base() -> str:
+    return (os.environ.get(LINKEDIN_BASE_ENV) or "https://www.linkedin.com").rstrip("/")
+
+
+def _indeed_base() -> str:
+    return (os.environ.get(INDEED_BASE_ENV) or "https://www.indeed.com").rstrip("/")
+
+
+DEFAULT_WORKERS = 4
+# Search tasks (term × source) run at once; the per-host limiter does the pacing.
+MAX_SEARCH_WORKERS = 8
+DEFAULT_MAX_TERMS = 4
+# Guest search pages hold at most this many cards.
+LINKEDIN_PAGE_SIZE = 25
+# Seconds spent paginating a single term before moving on.
+DEFAULT_TERM_TIME_BUDGET = 60.0
+
+
+class CancelToken:
+    """Stops a scrape from scheduling new requests: cancel() it, or give it a deadline."""
+
+    def __init__(self, deadline: Optional[float] = None):
+        self._event = threading.Event()
+        self.deadline = time.monotonic() + deadline if deadline is not None else None
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self._event.set()
+        return self._event.is_set()
+
+
+# Responses that mean the session itself is no longer accepted (LinkedIn's 999
+# is its bot wall), as opposed to a page that simply has nothing on it.
+SESSION_BLOCKED_STATUSES = frozenset({401, 403, 999})
+_AUTH_WALL_PATHS = ("/authwall", "/login", "/checkpoint", "/uas/login")
+
+
+@dataclass
+class FetchTally:
+    """Requests actually sent inside a tally_requests() block (cache hits excluded) and how they were answered."""
+
+    requests: int = 0
+    throttled: int = 0
+    blocked: int = 0
+
+    def add(self, other: "FetchTally") -> None:
+        self.requests += other.requests
+        self.throttled += other.throttled
+        self.blocked += other.blocked
+
+
+_TALLY = threading.local()
+
+
+@contextmanager
+def tally_requests() -> Iterator[FetchTally]:
+    """Count this thread's _fetch_text outcomes; nested tallies also count toward the enclosing one."""
+    outer = getattr(_TALLY, "current", None)
+    tally = FetchTally()
+    _TALLY.current = tally
+    try:
+        yield tally
+    finally:
+        _TALLY.current = outer
+        if outer is not None:
+            outer.add(tally)
+
+
+def _is_blocked(r: requests.Response) -> bool:
+    """Blocked status, or redirected to a sign-in wall instead of the page asked for."""
+    if r.status_code in SESSION_BLOCKED_STATUSES:
+        return True
+    return bool(r.history) and urlsplit(r.url).path.startswith(_AUTH_WALL_PATHS)
+
+
+def _fetch_text(
+    session: requests.Session,
+    url: str,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    kind: str = "detail",
+    retries: int = 2,
+    cancel: Optional[CancelToken] = None,
+) -> Optional[str]:
+    """
+    GET a page body through the cache and the host's rate limiter.
+
+    Fresh cache entries are returned without a request; stale ones are
+    revalidated with If-None-Match / If-Modified-Since. Throttled responses are
+    retried after the limiter's back-off. Returns None without a request once
+    cancel has fired.
+    """
+    entry = cache.get(url) if cache else None
+    if entry and entry.age < DEFAULT_TTLS.get(kind, 0):
+        return entry.body
+
+    headers: Dict[str, str] = {}
+    if entry and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+
+    should_stop = (lambda: cancel.cancelled) if cancel else None
+    tally = getattr(_TALLY, "current", None) or FetchTally()
+    for attempt in range(retries + 1):
+        if should_stop and should_stop():
+            return None
+        if limiter and not limiter.acquire(url, should_stop):
+            return None
+        tally.requests += 1
+        try:
+            r = session.get(url, headers=headers, timeout=15)
+        except requests.RequestException:
+            if limiter:
+                limiter.record(url, None)
+            continue
+        if limiter:
+            limiter.record(url, r.status_code, retry_after_seconds(r.headers.get("Retry-After")))
+        if r.status_code in THROTTLE_STATUSES:
+            tally.throttled += 1
+        if _is_blocked(r):
+            tally.blocked += 1
+            if r.status_code in THROTTLE_STATUSES and attempt < retries:
+                continue
+            return None
+        if r.status_code == 304 and entry:
+            cache.touch(url)
+            return entry.body
+        if r.status_code in THROTTLE_STATUSES and attempt < retries:
+            continue
+        if not r.ok:
+            return None
+        if cache:
+            cache.put(url, r.text, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        recorder = get_recorder()
+        if recorder:
+            recorder.record(kind, url, r.text)
+        return r.text
+    return None
+
+
 # ── Search term extraction ────────────────────────────────────────────────────
 
-def extract_search_terms(fingerprints: List[Dict]) -> List[str]:
-    """Derive search queries from liked-job fingerprints (up to 4 terms)."""
+def extract_search_terms(fingerprints: List[Dict], max_terms: int = DEFAULT_MAX_TERMS) -> List[str]:
+    """Derive search queries from liked-job fingerprints (up to max_terms)."""
     terms: list[str] = []
     seen: set[str] = set()
 
@@ -53,72 +229,54 @@ def extract_search_terms(fingerprints: List[Dict]) -> List[str]:
                     terms.append(combo)
                     seen.add(combo.lower())
 
-    return terms[:4]
+    return terms[:max_terms]
 
 
-# ── LinkedIn scraper ──────────────────────────────────────────────────────────
+# ── HTML parsing ──────────────────────────────────────────────────────────────
 
-def _make_session() -> requests.Session:
-    """Create a session with cookies by visiting LinkedIn's public jobs page."""
-    session = requests.Session()
-    session.headers.update(_BASE_HEADERS)
-    try:
-        session.get(
-            "https://www.linkedin.com/jobs/search/?keywords=manager&location=United+States",
-            timeout=15,
-        )
-        time.sleep(1.5)
-    except Exception:
-        pass
-    return session
+try:
+    import lxml  # noqa: F401
 
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
-def _extract_job_id_from_href(href: str) -> Optional[str]:
-    """Pull the numeric job ID from a LinkedIn /jobs/view/ URL."""
-    # Pattern: /jobs/view/some-title-at-company-1234567890
-    m = re.search(r"/jobs/view/[^?/]*?(\d{8,})", href)
-    if m:
-        return m.group(1)
-    # Fallback: just find any long number in the URL
-    m = re.search(r"(\d{9,})", href)
-    return m.group(1) if m else None
+# Only build the parts of the page we read: the result cards and the description container.
+_CARD_STRAINER = SoupStrainer("li")
+_DESCRIPTION_STRAINER = SoupStrainer(
+    ["div", "section"], class_=["show-more-less-html__markup", "description__text", "description"]
+)
 
+_SEL_CARD_LINK = sv.compile("a.base-card__full-link")
+_SEL_CARD_LINK_FALLBACK = sv.compile("a[href*='/jobs/view/']")
+_SEL_CARD_TITLE = sv.compile("h3.base-search-card__title")
+_SEL_CARD_COMPANY = sv.compile("h4.base-search-card__subtitle")
+_SEL_CARD_LOCATION = sv.compile("span.job-search-card__location")
+_SEL_DESCRIPTION = [
+    sv.compile("div.show-more-less-html__markup"),
+    sv.compile("div.description__text"),
+    sv.compile("section.description"),
+]
 
-def _search_linkedin(
-    session: requests.Session, keywords: str, location: str, count: int = 20
-) -> List[Dict]:
-    """Fetch job cards from LinkedIn's guest search API."""
-    url = (
-        "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-        f"?keywords={requests.utils.quote(keywords)}"
-        f"&location={requests.utils.quote(location)}"
-        f"&count={count}&start=0"
-    )
-    try:
-        r = session.get(url, timeout=15)
-        r.raise_for_status()
-    except Exception as e:
-        return []
 
-    soup = BeautifulSoup(r.text, "html.parser")
+def parse_search_cards(html: str, location: str = "") -> List[Dict]:
+    """Job cards from a guest search results page."""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_CARD_STRAINER)
     jobs = []
 
-    for card in soup.select("li"):
-        a_tag = (
-            card.select_one("a.base-card__full-link")
-            or card.select_one("a[href*='/jobs/view/']")
-        )
+    for card in soup.find_all("li"):
+        a_tag = _SEL_CARD_LINK.select_one(card) or _SEL_CARD_LINK_FALLBACK.select_one(card)
         if not a_tag:
             continue
 
         href = a_tag.get("href", "")
-        job_id = _extract_job_id_from_href(href)
+        job_id = extract_job_id_from_href(href)
         if not job_id:
             continue
 
-        title_el = card.select_one("h3.base-search-card__title") or card.select_one("h3")
-        company_el = card.select_one("h4.base-search-card__subtitle") or card.select_one("h4")
-        loc_el = card.select_one("span.job-search-card__location")
+        title_el = _SEL_CARD_TITLE.select_one(card) or card.find("h3")
+        company_el = _SEL_CARD_COMPANY.select_one(card) or card.find("h4")
+        loc_el = _SEL_CARD_LOCATION.select_one(card)
 
         jobs.append({
             "job_id": job_id,
@@ -131,33 +289,227 @@ def _search_linkedin(
     return jobs
 
 
-def _fetch_description_linkedin(session: requests.Session, job_id: str) -> Optional[str]:
-    """Fetch a job's full description from LinkedIn's guest detail endpoint."""
-    url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
+def parse_description(html: str) -> Optional[str]:
+    """Description text from a guest job detail page, or None if it is missing or too short."""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=_DESCRIPTION_STRAINER)
+    for selector in _SEL_DESCRIPTION:
+        desc_el = selector.select_one(soup)
+        if desc_el:
+            text = desc_el.get_text(separator="\n", strip=True)
+            return text if len(text) > 80 else None
+    return None
+
+
+# ── LinkedIn scraper ──────────────────────────────────────────────────────────
+
+# Reuse warmed cookies for this long before visiting the public jobs page again.
+SESSION_TTL = 12 * 60 * 60
+
+_SESSION_LOCK = threading.Lock()
+_SESSIONS: Dict[str, Tuple[requests.Session, float]] = {}
+
+
+def _session_path() -> Path:
+    return get_data_dir() / "scraper_session.json"
+
+
+def _make_session() -> requests.Session:
+    """Create a session with cookies by visiting LinkedIn's public jobs page."""
+    session = requests.Session()
+    session.headers.update(_BASE_HEADERS)
     try:
-        r = session.get(url, timeout=15)
-        r.raise_for_status()
+        session.get(
+            f"{_linkedin_base()}/jobs/search/?keywords=manager&location=United+States",
+            timeout=15,
+        )
+        time.sleep(1.5)
     except Exception:
+        pass
+    return session
+
+
+def _has_live_cookies(session: requests.Session) -> bool:
+    now = time.time()
+    host = urlsplit(_linkedin_base()).hostname or ""
+    return any(
+        host.endswith((cookie.domain or "").lstrip(".") or host) and (cookie.expires is None or cookie.expires > now)
+        for cookie in session.cookies
+    )
+
+
+def save_session(session: requests.Session, warmed_at: Optional[float] = None) -> None:
+    """Persist the session's cookie jar (and when it was warmed up) to the workspace."""
+    if warmed_at is None:
+        with _SESSION_LOCK:
+            warmed_at = next((t for sess, t in _SESSIONS.values() if sess is session), time.time())
+    cookies = [
+        {
+            "name": c.name,
+            "value": c.value,
+            "domain": c.domain,
+            "path": c.path,
+            "expires": c.expires,
+            "secure": c.secure,
+        }
+        for c in session.cookies
+    ]
+    path = _session_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"warmed_at": warmed_at, "cookies": cookies}), encoding="utf-8")
+
+
+def _load_session() -> Optional[Tuple[requests.Session, float]]:
+    path = _session_path()
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        warmed_at = float(data.get("warmed_at") or 0)
+        cookies = data.get("cookies") or []
+    except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+        return None
+    if time.time() - warmed_at > SESSION_TTL:
         return None
+    session = requests.Session()
+    session.headers.update(_BASE_HEADERS)
+    for c in cookies:
+        session.cookies.set_cookie(
+            requests.cookies.create_cookie(
+                c["name"],
+                c["value"],
+                domain=c.get("domain") or "",
+                path=c.get("path") or "/",
+                expires=c.get("expires"),
+                secure=bool(c.get("secure")),
+            )
+        )
+    return session, warmed_at
+
 
-    soup = BeautifulSoup(r.text, "html.parser")
+def get_session(force_warm: bool = False) -> Tuple[requests.Session, bool]:
+    """
+    Shared LinkedIn session for this workspace, warm-started from saved cookies.
 
-    desc_el = (
-        soup.select_one("div.show-more-less-html__markup")
-        or soup.select_one("div.description__text")
-        or soup.select_one("section.description")
+    Returns (session, reused); reused is False when the session was just warmed
+    up. Pass force_warm after requests start failing with a reused session.
+    """
+    key = str(_session_path())
+    with _SESSION_LOCK:
+        if not force_warm:
+            cached = _SESSIONS.get(key) or _load_session()
+            if cached and time.time() - cached[1] < SESSION_TTL and _has_live_cookies(cached[0]):
+                _SESSIONS[key] = cached
+                return cached[0], True
+        session = _make_session()
+        warmed_at = time.time()
+        _SESSIONS[key] = (session, warmed_at)
+        save_session(session, warmed_at)
+        return session, False
+
+
+def _search_linkedin(
+    session: requests.Session,
+    keywords: str,
+    location: str,
+    count: int = 20,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    start: int = 0,
+    cancel: Optional[CancelToken] = None,
+) -> Optional[List[Dict]]:
+    """Fetch one page of job cards from LinkedIn's guest search API. None if the request failed."""
+    url = (
+        f"{_linkedin_base()}/jobs-guest/jobs/api/seeMoreJobPostings/search"
+        f"?keywords={requests.utils.quote(keywords)}"
+        f"&location={requests.utils.quote(location)}"
+        f"&count={count}&start={start}"
     )
+    html = _fetch_text(session, url, limiter, cache, kind="search", cancel=cancel)
+    if html is None:
+        return None
 
-    if desc_el:
-        text = desc_el.get_text(separator="\n", strip=True)
-        return text if len(text) > 80 else None
+    return parse_search_cards(html, location)
 
-    return None
+
+def _iter_linkedin_cards(
+    session: requests.Session,
+    keywords: str,
+    location: str,
+    max_results: int = 15,
+    time_budget: float = DEFAULT_TERM_TIME_BUDGET,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    start: int = 0,
+    cancel: Optional[CancelToken] = None,
+) -> Iterator[Dict]:
+    """
+    Walk search result pages lazily from offset `start`, yielding cards as
+    each page is parsed.
+
+    Stops at max_results cards, after time_budget seconds, when cancel fires,
+    or at the first page that is empty or contains nothing new (LinkedIn
+    repeats the last page once results run out).
+    """
+    deadline = time.monotonic() + time_budget
+    seen: set[str] = set()
+    while len(seen) < max_results and time.monotonic() < deadline:
+        if cancel and cancel.cancelled:
+            return
+        page_size = min(LINKEDIN_PAGE_SIZE, max_results - len(seen))
+        cards = _search_linkedin(
+            session, keywords, location, count=page_size, limiter=limiter, cache=cache, start=start, cancel=cancel
+        )
+        if not cards:
+            return
+        fresh = [card for card in cards if card["job_id"] not in seen]
+        if not fresh:
+            return
+        for card in fresh[: max_results - len(seen)]:
+            seen.add(card["job_id"])
+            yield card
+        start += len(cards)
+
+
+def _fetch_description_linkedin(
+    session: requests.Session,
+    job_id: str,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    cancel: Optional[CancelToken] = None,
+) -> Optional[str]:
+    """Fetch a job's full description from LinkedIn's guest detail endpoint."""
+    url = f"{_linkedin_base()}/jobs-guest/jobs/api/jobPosting/{job_id}"
+    html = _fetch_text(session, url, limiter, cache, kind="detail", cancel=cancel)
+    if html is None:
+        return None
+
+    return parse_description(html)
+
+
+# ── Known postings ────────────────────────────────────────────────────────────
+
+def load_known_postings() -> Set[Tuple[str, str]]:
+    """Postings already saved to the inbox or stored in jobs.db."""
+    known = known_posting_keys()
+    for source in list_job_sources():
+        m = SOURCE_URL_RE.search(source)
+        key = posting_key(m.group(0)) if m else None
+        if key:
+            known.add(key)
+    return known
 
 
-# ── Indeed RSS fallback ───────────────────────────────────────────────────────
+# ── Indeed RSS ────────────────────────────────────────────────────────────────
 
-def _search_indeed_rss(keywords: str, location: str, count: int = 20) -> List[Dict]:
+def _search_indeed_rss(
+    keywords: str,
+    location: str,
+    count: int = 20,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    start: int = 0,
+) -> List[Dict]:
     """
     Pull jobs from Indeed's RSS feed — very reliable, no cookies needed.
     Descriptions are short summaries (not full JDs) but good enough to fingerprint.
@@ -168,13 +520,17 @@ def _search_indeed_rss(keywords: str, location: str, count: int = 20) -> List[Di
         return []
 
     url = (
-        f"https://www.indeed.com/rss"
+        f"{_indeed_base()}/rss"
         f"?q={requests.utils.quote(keywords)}"
         f"&l={requests.utils.quote(location)}"
         f"&limit={count}"
+        + (f"&start={start}" if start else "")
     )
+    xml = _fetch_text(session or requests.Session(), url, limiter, cache, kind="rss")
+    if xml is None:
+        return []
     try:
-        feed = feedparser.parse(url)
+        feed = feedparser.parse(xml)
     except Exception:
         return []
 
@@ -208,109 +564,603 @@ def _search_indeed_rss(keywords: str, location: str, count: int = 20) -> List[Di
     return jobs
 
 
+# ── Alert feeds ───────────────────────────────────────────────────────────────
+
+def _search_alert_feeds(
+    feed_urls: List[str],
+    keywords: str,
+    count: int = 20,
+    session: Optional[requests.Session] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    cache: Optional[HttpCache] = None,
+    offset: int = 0,
+) -> List[Dict]:
+    """Entries from the profile's alert RSS feeds whose title or summary mention every keyword, after the first `offset`."""
+    try:
+        import feedparser
+    except ImportError:
+        return []
+
+    words = [w for w in re.findall(r"\w+", keywords.lower()) if len(w) > 2]
+    jobs = []
+    skip = offset
+    for feed_url in feed_urls:
+        xml = _fetch_text(session or requests.Session(), feed_url, limiter, cache, kind="rss")
+        if xml is None:
+            continue
+        try:
+            feed = feedparser.parse(xml)
+        except Exception:
+            continue
+        for entry in feed.entries:
+            title = entry.get("title", "New Job")
+            summary = BeautifulSoup(entry.get("summary", ""), "html.parser").get_text(separator="\n", strip=True)
+            haystack = f"{title}\n{summary}".lower()
+            if not summary or not all(w in haystack for w in words):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            link = entry.get("link", "")
+            jobs.append({
+                "job_id": entry.get("id") or link or title,
+                "title": title,
+                "company": entry.get("author") or "Unknown Company",
+                "location": "",
+                "url": link,
+                "description": summary,
+            })
+            if len(jobs) >= count:
+                return jobs
+    return jobs
+
+
+# ── Source adapters ───────────────────────────────────────────────────────────
+
+@dataclass
+class TermYield:
+    """What one search term produced in a scrape (see term_planner.py)."""
+
+    requests: int = 0
+    found: int = 0
+    new: int = 0
+    high_score: int = 0
+    # Throttled or blocked responses met while searching and fetching this term.
+    throttled: int = 0
+    # Every search ran to the end and every card was fetched (not cancelled or failed).
+    complete: bool = False
+
+
+@dataclass
+class ScrapeContext:
+    """Shared HTTP state handed to every source during one scrape."""
+
+    session: requests.Session
+    limiter: HostRateLimiter
+    cache: Optional[HttpCache] = None
+    reused_session: bool = False
+    term_time_budget: float = DEFAULT_TERM_TIME_BUDGET
+    cancel: CancelToken = field(default_factory=CancelToken)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class JobSource(ABC):
+    """
+    A place jobs come from. search() yields cards (job_id, title, company,
+    location, url and optionally description): results offset .. limit-1 of
+    the term's results, so a resumed search picks up where the last one
+    stopped and nothing when offset >= limit. fetch_detail() returns the full
+    description for a card that arrived without one. Both should stop early
+    once ctx.cancel fires. request_cost() is what the term planner budgets
+    for one term.
+    """
+
+    name = "source"
+    label = "Source"
+
+    @abstractmethod
+    def search(self, ctx: ScrapeContext, term: str, location: str, limit: int, offset: int = 0) -> Iterable[Dict]:
+        ...
+
+    def fetch_detail(self, ctx: ScrapeContext, card: Dict) -> Optional[str]:
+        return card.get("description")
+
+    def request_cost(self, limit: int) -> int:
+        """Requests one term costs at most: a single results page with descriptions included."""
+        return 1
+
+
+class LinkedInSource(JobSource):
+    name = "linkedin"
+    label = "LinkedIn"
+
+    def search(self, ctx: ScrapeContext, term: str, location: str, limit: int, offset: int = 0) -> Iterator[Dict]:
+        if offset >= limit:
+            return
+
+        def _cards() -> Iterator[Dict]:
+            return _iter_linkedin_cards(
+                ctx.session, term, location, max_results=limit - offset,
+                time_budget=ctx.term_time_budget, limiter=ctx.limiter, cache=ctx.cache,
+                start=offset, cancel=ctx.cancel,
+            )
+
+        got_cards = False
+        with tally_requests() as tally:
+            for card in _cards():
+                got_cards = True
+                yield card
+        # An empty result is a legitimate answer; only a blocked or sign-in-walled
+        # response says the saved cookies went stale server-side: warm up once and retry.
+        if got_cards or ctx.cancel.cancelled or not tally.blocked:
+            return
+        with ctx.lock:
+            if not ctx.reused_session:
+                return
+            ctx.session, ctx.reused_session = get_session(force_warm=True)
+        yield from _cards()
+
+    def fetch_detail(self, ctx: ScrapeContext, card: Dict) -> Optional[str]:
+        return _fetch_description_linkedin(ctx.session, card["job_id"], ctx.limiter, ctx.cache, cancel=ctx.cancel)
+
+    def request_cost(self, limit: int) -> int:
+        """Its search pages plus one detail fetch per result."""
+        return limit + max(1, math.ceil(limit / LINKEDIN_PAGE_SIZE))
+
+
+class IndeedSource(JobSource):
+    name = "indeed"
+    label = "Indeed"
+
+    def search(self, ctx: ScrapeContext, term: str, location: str, limit: int, offset: int = 0) -> List[Dict]:
+        if offset >= limit:
+            return []
+        return _search_indeed_rss(
+            term, location, count=limit - offset, session=ctx.session, limiter=ctx.limiter, cache=ctx.cache,
+            start=offset,
+        )
+
+
+class AlertFeedSource(JobSource):
+    """The RSS feeds configured as alert sources in the interest profile."""
+
+    name = "alerts"
+    label = "Alert feeds"
+
+    def __init__(self, feed_urls: Optional[List[str]] = None):
+        self.feed_urls = feed_urls
+
+    def _feed_urls(self) -> List[str]:
+        if self.feed_urls is not None:
+            return self.feed_urls
+        from .profile import load_profile
+
+        return load_profile().alert_sources
+
+    def search(self, ctx: ScrapeContext, term: str, location: str, limit: int, offset: int = 0) -> List[Dict]:
+        feed_urls = self._feed_urls()
+        if not feed_urls or offset >= limit:
+            return []
+        return _search_alert_feeds(
+            feed_urls, term, count=limit - offset, session=ctx.session, limiter=ctx.limiter, cache=ctx.cache,
+            offset=offset,
+        )
+
+    def request_cost(self, limit: int) -> int:
+        """Every feed is fetched for every term."""
+        return len(self._feed_urls())
+
+
+SOURCES: Dict[str, JobSource] = {}
+
+
+def register_source(source: JobSource) -> None:
+    SOURCES[source.name] = source
+
+
+for _source in (LinkedInSource(), IndeedSource(), AlertFeedSource()):
+    register_source(_source)
+
+DEFAULT_SOURCES = ("linkedin", "indeed", "alerts")
+
+
+def term_request_cost(results_per_term: int, sources: Optional[Iterable[str]] = None) -> int:
+    """Requests one search term costs across the enabled sources (default: DEFAULT_SOURCES)."""
+    return sum(
+        SOURCES[name].request_cost(results_per_term) for name in (sources or DEFAULT_SOURCES) if name in SOURCES
+    )
+
+
+# ── Resume cursor ─────────────────────────────────────────────────────────────
+
+def _cursor_path() -> Path:
+    return get_data_dir() / "scrape_cursor.json"
+
+
+def load_scrape_cursor() -> Optional[Dict]:
+    """What an interrupted scrape left undone: unsearched (source, term, offset)s and unfetched cards."""
+    path = _cursor_path()
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+
+
+def _save_scrape_cursor(remaining: List[Dict], pending: List[Dict]) -> None:
+    path = _cursor_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"saved_at": time.time(), "remaining": remaining, "pending": pending}, indent=2),
+        encoding="utf-8",
+    )
+
+
+def clear_scrape_cursor() -> None:
+    _cursor_path().unlink(missing_ok=True)
+
+
 # ── Public interface ──────────────────────────────────────────────────────────
 
-def scrape_similar_jobs(
+def iter_similar_jobs(
     fingerprints: List[Dict],
     location: str = "United States",
     results_per_term: int = 15,
     delay: float = 1.5,
     on_progress: Optional[Callable] = None,
-) -> List[Dict]:
+    workers: int = DEFAULT_WORKERS,
+    use_cache: bool = True,
+    skip_known: bool = True,
+    max_terms: int = DEFAULT_MAX_TERMS,
+    term_time_budget: float = DEFAULT_TERM_TIME_BUDGET,
+    sources: Optional[Iterable[str]] = None,
+    search_terms: Optional[List[str]] = None,
+    term_yields: Optional[Dict[str, TermYield]] = None,
+    deadline: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+    resume: bool = True,
+) -> Iterator[Dict]:
     """
-    Search LinkedIn (+ Indeed fallback) for jobs matching the fingerprints.
-    Returns list of dicts: title, company, location, url, description, search_term, source.
+    Yield scraped jobs as their descriptions arrive.
+
+    For each of up to max_terms search terms, every enabled source (default:
+    all registered) is searched concurrently, up to results_per_term cards per
+    source. A pool of `workers` threads fetches descriptions as cards arrive,
+    and every card goes through one dedupe stage (identity keys as in
+    identity.claim_jobs, and with skip_known the postings already in jobs.db
+    or the inbox). A source or term whose search raises is logged and skipped.
+    Requests are paced per host by a HostRateLimiter starting at one request
+    per `delay` seconds; with use_cache pages go through the on-disk HTTP
+    cache (see http_cache.py).
+
+    search_terms overrides the terms derived from fingerprints (e.g. a plan
+    from term_planner). term_yields, when given, is filled with per-term
+    counts: requests actually sent (cache hits excluded), throttled
+    responses, cards and new jobs, and whether the term's run completed.
+
+    After `deadline` seconds, or once `cancel` fires (or the caller stops
+    iterating), no new requests are scheduled and the run winds down with
+    what it has. The unsearched terms and unfetched cards are saved as a
+    resume cursor, which the next run (with resume) picks up first.
     """
-    search_terms = extract_search_terms(fingerprints)
-    if not search_terms:
-        return []
+    if search_terms is None:
+        search_terms = extract_search_terms(fingerprints, max_terms=max_terms)
+    enabled = [SOURCES[name] for name in (sources or DEFAULT_SOURCES) if name in SOURCES]
+    cursor = load_scrape_cursor() if resume else None
+    if cursor:
+        clear_scrape_cursor()
+    by_name = {source.name: source for source in enabled}
 
-    if on_progress:
-        on_progress(0, len(search_terms) + 1, "Initializing session…")
+    # (source, term, offset) search tasks: leftovers from an interrupted run first.
+    tasks: List[Tuple[JobSource, str, int]] = []
+    for item in (cursor or {}).get("remaining", []):
+        offset = int(item.get("offset") or 0)
+        if item.get("source") in by_name and offset < results_per_term:
+            tasks.append((by_name[item["source"]], item["term"], offset))
+    planned = {(source.name, term) for source, term, _ in tasks}
+    for term in search_terms:
+        for source in enabled:
+            if (source.name, term) not in planned:
+                tasks.append((source, term, 0))
+    pending_cards = [item for item in (cursor or {}).get("pending", []) if item.get("source") in by_name]
+    if not tasks and not pending_cards:
+        return
 
-    session = _make_session()
-    all_jobs: list[Dict] = []
-    seen_ids: set[str] = set()
-    total = len(search_terms)
+    terms = list(dict.fromkeys([term for _, term, _ in tasks] + [item["term"] for item in pending_cards]))
+    yields = term_yields if term_yields is not None else {}
+    for term in terms:
+        yields.setdefault(term, TermYield())
+    step_of = {term: i for i, term in enumerate(terms)}
+    total = len(terms)
 
-    for step, term in enumerate(search_terms):
-        if on_progress:
-            on_progress(step, total, f"Searching LinkedIn: {term}…")
+    if on_progress:
+        on_progress(0, total + 1, "Resuming previous scrape…" if cursor else "Initializing session…")
 
-        # ── LinkedIn ──
-        cards = _search_linkedin(session, term, location, count=results_per_term)
+    token = cancel or CancelToken()
+    if deadline is not None:
+        token.deadline = min(token.deadline or float("inf"), time.monotonic() + deadline)
 
-        li_found = 0
-        for card in cards:
-            jid = card["job_id"]
-            if jid in seen_ids:
-                continue
-            seen_ids.add(jid)
+    session, reused = get_session()
+    ctx = ScrapeContext(
+        session=session,
+        limiter=HostRateLimiter(rate=1.0 / delay if delay > 0 else 4.0, burst=max(workers, 1)),
+        cache=get_http_cache() if use_cache else None,
+        reused_session=reused,
+        term_time_budget=term_time_budget,
+        cancel=token,
+    )
+    known = load_known_postings() if skip_known else set()
+    claims = RunClaims()
+    events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    futures: List[Future] = []
+    futures_lock = threading.Lock()
+    offsets: Dict[Tuple[str, str], int] = {(source.name, term): offset for source, term, offset in tasks}
+    searched: Set[Tuple[str, str]] = set()
+    unfetched: Dict[Tuple[str, str], Dict] = {}
 
-            time.sleep(delay)
-            description = _fetch_description_linkedin(session, jid)
-            if not description:
-                continue
+    def _claim(source: JobSource, card: Dict) -> bool:
+        key = posting_key(card.get("url", ""))
+        with futures_lock:
+            if key in known:
+                return False
+            # Same keys and native-ID veto as identity.claim_jobs applies when the jobs are stored.
+            return claims.claim(f"{source.name}:{card['job_id']}", card)
 
-            all_jobs.append({
+    def _emit(source: JobSource, term: str, card: Dict, description: Optional[str]) -> None:
+        if description:
+            with futures_lock:
+                yields[term].new += 1
+            events.put(("job", {
+                "job_id": card["job_id"],
                 "title": card["title"],
                 "company": card["company"],
-                "location": card["location"],
+                "location": card["location"] or location,
                 "url": card["url"],
                 "description": description,
                 "search_term": term,
-                "source": "linkedin",
-            })
-            li_found += 1
+                "source": source.name,
+            }))
+
+    def _count(term: str, tally: FetchTally) -> None:
+        with futures_lock:
+            yields[term].requests += tally.requests
+            yields[term].throttled += tally.throttled + tally.blocked
+
+    def _detail(source: JobSource, term: str, card: Dict) -> None:
+        if token.cancelled:
+            return
+        with tally_requests() as tally:
+            try:
+                description = source.fetch_detail(ctx, card)
+            except Exception:
+                logger.warning("%s: fetching %s failed", source.label, card.get("url") or card["job_id"], exc_info=True)
+                description = None
+        _count(term, tally)
+        if description is None and token.cancelled:
+            return  # interrupted, not missing: keep it for the resume cursor
+        with futures_lock:
+            unfetched.pop((source.name, card["job_id"]), None)
+        _emit(source, term, card, description)
 
-        # ── Indeed fallback if LinkedIn gave nothing ──
-        if li_found == 0:
-            if on_progress:
-                on_progress(step, total, f"LinkedIn empty — trying Indeed: {term}…")
-            indeed_jobs = _search_indeed_rss(term, location, count=results_per_term)
-            for job in indeed_jobs:
-                jid = job["job_id"]
-                if jid in seen_ids:
-                    continue
-                seen_ids.add(jid)
-                job["search_term"] = term
-                job["source"] = "indeed"
-                all_jobs.append(job)
+    def _queue_detail(source: JobSource, term: str, card: Dict) -> None:
+        with futures_lock:
+            unfetched[(source.name, card["job_id"])] = {"source": source.name, "term": term, "card": card}
+            futures.append(detail_pool.submit(_detail, source, term, card))
 
-        time.sleep(delay)
+    def _search(source: JobSource, term: str, offset: int) -> None:
+        if token.cancelled:
+            return
+        events.put(("progress", (step_of[term], f"Searching {source.label}: {term}…")))
+        cards = 0
+        failed = False
+        with tally_requests() as tally:
+            try:
+                for card in source.search(ctx, term, location, results_per_term, offset):
+                    if token.cancelled:
+                        break
+                    cards += 1
+                    with futures_lock:
+                        offsets[(source.name, term)] += 1
+                    if not _claim(source, card):
+                        continue
+                    if card.get("description"):
+                        _emit(source, term, card, card["description"])
+                        continue
+                    _queue_detail(source, term, card)
+            except Exception:
+                # One broken source or term should not take the rest of the scrape down with it.
+                logger.warning("%s search for %r failed", source.label, term, exc_info=True)
+                failed = True
+        _count(term, tally)
+        with futures_lock:
+            # A search cut short after taking every card it was asked for has nothing left either.
+            if not failed and (not token.cancelled or offsets[(source.name, term)] >= results_per_term):
+                searched.add((source.name, term))
+            yields[term].found += cards
 
-    return all_jobs
+    try:
+        search_workers = max(1, min(len(tasks), MAX_SEARCH_WORKERS))
+        with ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="search") as search_pool, \
+                ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="scrape") as detail_pool:
+            try:
+                for item in pending_cards:
+                    source = by_name[item["source"]]
+                    if _claim(source, item["card"]):
+                        _queue_detail(source, item["term"], item["card"])
+                for source, term, offset in tasks:
+                    futures.append(search_pool.submit(_search, source, term, offset))
+
+                announced_stop = False
+                while True:
+                    if token.cancelled and not announced_stop and on_progress:
+                        on_progress(total - 1, total, "Stopping — finishing requests already in flight…")
+                        announced_stop = True
+                    try:
+                        kind, payload = events.get(timeout=0.1)
+                    except queue.Empty:
+                        with futures_lock:
+                            running = [f for f in futures if not f.done()]
+                        if not running and events.empty():
+                            break
+                        continue
+                    if kind == "job":
+                        yield payload
+                    elif on_progress:
+                        step, msg = payload
+                        on_progress(step, total, msg)
+            except BaseException:
+                # Caller stopped iterating or something broke: let the workers wind down now.
+                token.cancel()
+                raise
+    finally:
+        with futures_lock:
+            for term in terms:
+                yields[term].complete = all(
+                    (source.name, task_term) in searched for source, task_term, _ in tasks if task_term == term
+                ) and not any(item["term"] == term for item in unfetched.values())
+        remaining = [
+            {"source": source.name, "term": term, "offset": offsets[(source.name, term)]}
+            for source, term, _ in tasks
+            if (source.name, term) not in searched
+        ]
+        # A caller closing the generator after a finished run also cancels the
+        # token; only write a cursor when something was actually left undone.
+        if token.cancelled and (remaining or unfetched):
+            _save_scrape_cursor(remaining=remaining, pending=list(unfetched.values()))
+        save_session(ctx.session)
+
+
+def scrape_similar_jobs(
+    fingerprints: List[Dict],
+    location: str = "United States",
+    results_per_term: int = 15,
+    delay: float = 1.5,
+    on_progress: Optional[Callable] = None,
+    workers: int = DEFAULT_WORKERS,
+    use_cache: bool = True,
+    skip_known: bool = True,
+    max_terms: int = DEFAULT_MAX_TERMS,
+    term_time_budget: float = DEFAULT_TERM_TIME_BUDGET,
+    sources: Optional[Iterable[str]] = None,
+    search_terms: Optional[List[str]] = None,
+    term_yields: Optional[Dict[str, TermYield]] = None,
+    deadline: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+    resume: bool = True,
+) -> List[Dict]:
+    """
+    Search every enabled job source for jobs matching the fingerprints.
+    Returns list of dicts: job_id, title, company, location, url, description, search_term, source.
+    When stopped by deadline or cancel, returns the jobs collected so far.
+    """
+    return list(
+        iter_similar_jobs(
+            fingerprints,
+            location=location,
+            results_per_term=results_per_term,
+            delay=delay,
+            on_progress=on_progress,
+            workers=workers,
+            use_cache=use_cache,
+            skip_known=skip_known,
+            max_terms=max_terms,
+            term_time_budget=term_time_budget,
+            sources=sources,
+            search_terms=search_terms,
+            term_yields=term_yields,
+            deadline=deadline,
+            cancel=cancel,
+            resume=resume,
+        )
+    )
 
 
-# ── Save to inbox ─────────────────────────────────────────────────────────────
+# ── Save ──────────────────────────────────────────────────────────────────────
+
+def scraped_job_id(job: Dict) -> str:
+    """Stable jobs.db id for a scraped posting: company-title slug plus the posting's native id."""
+    slug = slugify(f"{job.get('company', 'company')}-{job.get('title', 'role')}")
+    key = posting_key(job.get("url", ""))
+    if not key:
+        return slug
+    native = key[1] if key[0] != "url" else hashlib.sha1(key[1].encode("utf-8")).hexdigest()[:10]
+    return f"{slug}-{slugify(native)}"
+
+
+def _job_meta(job: Dict) -> Dict[str, str]:
+    return {
+        "company": job.get("company", "company"),
+        "role": job.get("title", "role"),
+        "location": job.get("location", ""),
+        "source": f"{job.get('source', 'scraped')} ({job.get('url', '')})",
+        "search_term": job.get("search_term", ""),
+    }
+
 
 def save_jobs_to_inbox(jobs: List[Dict], inbox_dir: Path) -> List[Path]:
     """Write each job as a .md file with YAML frontmatter into inbox_dir."""
     saved: list[Path] = []
+    known: list[Tuple[str, str, Optional[str], Optional[str]]] = []
     inbox_dir.mkdir(parents=True, exist_ok=True)
+    # One directory listing up front instead of an exists() probe per candidate name.
+    taken = {p.name for p in inbox_dir.glob("*.md")}
+    next_suffix: Dict[str, int] = {}
 
     for job in jobs:
-        company = job.get("company", "company")
-        title = job.get("title", "role")
-        slug = slugify(f"{company}-{title}")
-
-        path = inbox_dir / f"{slug}.md"
-        counter = 1
-        while path.exists():
-            path = inbox_dir / f"{slug}-{counter}.md"
-            counter += 1
+        # The id keeps a later ingest of this file on the same jobs.db row as save_jobs_to_db would use.
+        meta = {"id": scraped_job_id(job), **_job_meta(job)}
+        slug = slugify(f"{meta['company']}-{meta['role']}")
 
-        frontmatter = (
-            f"---\n"
-            f"company: {company}\n"
-            f"role: {title}\n"
-            f"location: {job.get('location', '')}\n"
-            f"source: {job.get('source', 'scraped')} ({job.get('url', '')})\n"
-            f"search_term: \"{job.get('search_term', '')}\"\n"
-            f"---\n\n"
-        )
+        name = f"{slug}.md"
+        counter = next_suffix.get(slug, 1)
+        while name in taken:
+            name = f"{slug}-{counter}.md"
+            counter += 1
+        next_suffix[slug] = counter
+        taken.add(name)
 
-        path.write_text(frontmatter + job["description"], encoding="utf-8")
+        path = inbox_dir / name
+        path.write_text(render_front_matter(meta, job["description"]), encoding="utf-8")
         saved.append(path)
 
+        key = posting_key(job.get("url", ""))
+        if key:
+            known.append((key[0], key[1], job.get("url"), str(path)))
+
+    if known:
+        record_known_postings(known)
     return saved
+
+
+def save_jobs_to_db(jobs: List[Dict], bucket: str = "inbox") -> List[str]:
+    """
+    Store scraped jobs straight in jobs.db in one transaction, without
+    markdown files (export them later with app_logic.export_jobs_to_markdown).
+    Rows already stored for a job id are left as they are. Returns the job ids.
+    """
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    records = []
+    known: list[Tuple[str, str, Optional[str], Optional[str]]] = []
+    for job in jobs:
+        meta = _job_meta(job)
+        records.append({
+            "job_id": scraped_job_id(job),
+            "path": None,
+            "bucket": bucket,
+            "liked": 0,
+            "company": meta["company"],
+            "role": meta["role"],
+            "location": meta["location"],
+            "source": meta["source"],
+            "date_saved": today,
+            "body": job["description"],
+        })
+        key = posting_key(job.get("url", ""))
+        if key:
+            known.append((key[0], key[1], job.get("url"), None))
+
+    insert_new_jobs(records)
+    if known:
+        record_known_postings(known)
+    return [r["job_id"] for r in records]
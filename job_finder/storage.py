@@ -3,12 +3,15 @@ from __future__ import annotations
 import json
 import sqlite3
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from .config import get_db_path
 
+# Stay well under SQLite's host-parameter limit in IN (...) lookups.
+_LOOKUP_CHUNK = 500
+
 
 @dataclass
 class JobRecord:
@@ -73,6 +76,82 @@ def init_db() -> None:
         );
         """
     )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS known_postings (
+            source TEXT,
+            native_id TEXT,
+            url TEXT,
+            path TEXT,
+            first_seen TEXT,
+            PRIMARY KEY (source, native_id)
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS search_term_stats (
+            term TEXT PRIMARY KEY,
+            parent TEXT,
+            runs INTEGER DEFAULT 0,
+            requests INTEGER DEFAULT 0,
+            found INTEGER DEFAULT 0,
+            new INTEGER DEFAULT 0,
+            high_score INTEGER DEFAULT 0,
+            stale_runs INTEGER DEFAULT 0,
+            retired INTEGER DEFAULT 0,
+            last_run TEXT
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS alert_seen (
+            entry_id TEXT PRIMARY KEY,
+            feed TEXT,
+            first_seen TEXT,
+            last_seen TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_alert_seen_last_seen ON alert_seen (last_seen);")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_keys (
+            key TEXT PRIMARY KEY,
+            job_id TEXT NOT NULL,
+            created_at TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_keys_job_id ON job_keys (job_id);")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS job_duplicates (
+            duplicate_id TEXT PRIMARY KEY,
+            canonical_id TEXT NOT NULL,
+            source TEXT,
+            url TEXT,
+            linked_at TEXT
+        );
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_job_duplicates_canonical ON job_duplicates (canonical_id);")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_manifest (
+            path TEXT PRIMARY KEY,
+            bucket TEXT,
+            size INTEGER,
+            mtime_ns INTEGER,
+            content_hash TEXT,
+            body_hash TEXT,
+            job_id TEXT,
+            fingerprint_source TEXT,
+            ingested_at TEXT
+        );
+        """
+    )
     conn.commit()
     conn.close()
 
@@ -81,57 +160,151 @@ def _now() -> str:
     return datetime.utcnow().isoformat()
 
 
+_UPSERT_JOB_SQL = """
+    INSERT INTO jobs (
+        job_id, path, bucket, company, role, location, level, domain, skills, source,
+        date_saved, liked, body, fingerprint_json, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(job_id) DO UPDATE SET
+        path=excluded.path,
+        bucket=excluded.bucket,
+        company=excluded.company,
+        role=excluded.role,
+        location=excluded.location,
+        level=excluded.level,
+        domain=excluded.domain,
+        skills=excluded.skills,
+        source=excluded.source,
+        date_saved=excluded.date_saved,
+        liked=excluded.liked,
+        body=excluded.body,
+        fingerprint_json=excluded.fingerprint_json,
+        updated_at=excluded.updated_at;
+"""
+
+
+# Scrape saves: a posting scraped again must not reset a stored row's bucket,
+# liked flag, markdown path or Claude fingerprint.
+_INSERT_NEW_JOB_SQL = """
+    INSERT INTO jobs (
+        job_id, path, bucket, company, role, location, level, domain, skills, source,
+        date_saved, liked, body, fingerprint_json, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(job_id) DO NOTHING;
+"""
+
+
+def _job_params(job: Dict[str, Any]) -> tuple:
+    skills_json = json.dumps(job.get("skills") or [])
+    fingerprint_json = json.dumps(job.get("fingerprint")) if job.get("fingerprint") else None
+    return (
+        job.get("job_id"),
+        job.get("path"),
+        job.get("bucket"),
+        job.get("company"),
+        job.get("role"),
+        job.get("location"),
+        job.get("level"),
+        job.get("domain"),
+        skills_json,
+        job.get("source"),
+        job.get("date_saved"),
+        int(job.get("liked") or 0),
+        job.get("body"),
+        fingerprint_json,
+        job.get("created_at") or _now(),
+        _now(),
+    )
+
+
 def upsert_job(job: Dict[str, Any]) -> None:
     init_db()
     conn = _connect()
     cur = conn.cursor()
+    cur.execute(_UPSERT_JOB_SQL, _job_params(job))
+    conn.commit()
+    conn.close()
 
-    skills_json = json.dumps(job.get("skills") or [])
-    fingerprint_json = json.dumps(job.get("fingerprint")) if job.get("fingerprint") else None
 
-    cur.execute(
-        """
-        INSERT INTO jobs (
-            job_id, path, bucket, company, role, location, level, domain, skills, source,
-            date_saved, liked, body, fingerprint_json, created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(job_id) DO UPDATE SET
-            path=excluded.path,
-            bucket=excluded.bucket,
-            company=excluded.company,
-            role=excluded.role,
-            location=excluded.location,
-            level=excluded.level,
-            domain=excluded.domain,
-            skills=excluded.skills,
-            source=excluded.source,
-            date_saved=excluded.date_saved,
-            liked=excluded.liked,
-            body=excluded.body,
-            fingerprint_json=excluded.fingerprint_json,
-            updated_at=excluded.updated_at;
-        """,
-        (
-            job.get("job_id"),
-            job.get("path"),
-            job.get("bucket"),
-            job.get("company"),
-            job.get("role"),
-            job.get("location"),
-            job.get("level"),
-            job.get("domain"),
-            skills_json,
-            job.get("source"),
-            job.get("date_saved"),
-            int(job.get("liked") or 0),
-            job.get("body"),
-            fingerprint_json,
-            job.get("created_at") or _now(),
-            _now(),
-        ),
-    )
+def upsert_jobs(jobs: Iterable[Dict[str, Any]]) -> int:
+    """Upsert many jobs in a single transaction. Returns the number written."""
+    params = [_job_params(job) for job in jobs]
+    if not params:
+        return 0
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.executemany(_UPSERT_JOB_SQL, params)
+    conn.commit()
+    conn.close()
+    return len(params)
+
+
+def insert_new_jobs(jobs: Iterable[Dict[str, Any]]) -> int:
+    """Insert jobs in a single transaction, leaving rows that already exist untouched. Returns the number inserted."""
+    params = [_job_params(job) for job in jobs]
+    if not params:
+        return 0
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    before = conn.total_changes
+    cur.executemany(_INSERT_NEW_JOB_SQL, params)
+    inserted = conn.total_changes - before
+    conn.commit()
+    conn.close()
+    return inserted
+
+
+def update_fingerprints(fingerprints: Dict[str, Dict[str, Any]]) -> int:
+    """Set fingerprint_json on stored jobs (job_id -> fingerprint) in one transaction. Returns the number updated."""
+    now = _now()
+    params = [(json.dumps(fp), now, job_id) for job_id, fp in fingerprints.items() if fp]
+    if not params:
+        return 0
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    before = conn.total_changes
+    cur.executemany("UPDATE jobs SET fingerprint_json = ?, updated_at = ? WHERE job_id = ?", params)
+    updated = conn.total_changes - before
     conn.commit()
     conn.close()
+    return updated
+
+
+def stored_job_ids(job_ids: Iterable[str]) -> Set[str]:
+    """The given job ids that already have a row in jobs, in chunked lookups."""
+    ids = list(dict.fromkeys(job_ids))
+    if not ids:
+        return set()
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    found: Set[str] = set()
+    for start in range(0, len(ids), _LOOKUP_CHUNK):
+        chunk = ids[start:start + _LOOKUP_CHUNK]
+        cur.execute(f"SELECT job_id FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk)
+        found.update(row["job_id"] for row in cur.fetchall())
+    conn.close()
+    return found
+
+
+def get_jobs(job_ids: Iterable[str]) -> Dict[str, JobRecord]:
+    """job_id -> record for the ids that exist, in chunked lookups."""
+    ids = list(dict.fromkeys(job_ids))
+    if not ids:
+        return {}
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    found: Dict[str, JobRecord] = {}
+    for start in range(0, len(ids), _LOOKUP_CHUNK):
+        chunk = ids[start:start + _LOOKUP_CHUNK]
+        cur.execute(f"SELECT * FROM jobs WHERE job_id IN ({','.join('?' * len(chunk))})", chunk)
+        found.update((row["job_id"], _row_to_job(row)) for row in cur.fetchall())
+    conn.close()
+    return found
 
 
 def list_jobs(bucket: Optional[str] = None) -> List[JobRecord]:
@@ -178,6 +351,292 @@ def update_feedback(job_id: str, status: str, notes: Optional[str] = None) -> No
     conn.close()
 
 
+def list_job_sources() -> List[str]:
+    """The `source` column of every stored job (e.g. "linkedin (https://…)")."""
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("SELECT source FROM jobs WHERE source IS NOT NULL AND source != ''")
+    rows = cur.fetchall()
+    conn.close()
+    return [row["source"] for row in rows]
+
+
+def known_posting_keys() -> Set[Tuple[str, str]]:
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("SELECT source, native_id FROM known_postings")
+    rows = cur.fetchall()
+    conn.close()
+    return {(row["source"], row["native_id"]) for row in rows}
+
+
+def record_known_postings(postings: Iterable[Tuple[str, str, Optional[str], Optional[str]]]) -> None:
+    """Remember (source, native_id, url, path) tuples; existing entries keep their first_seen."""
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    now = _now()
+    cur.executemany(
+        """
+        INSERT INTO known_postings (source, native_id, url, path, first_seen)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(source, native_id) DO UPDATE SET
+            url=COALESCE(excluded.url, known_postings.url),
+            path=COALESCE(excluded.path, known_postings.path);
+        """,
+        [(source, native_id, url, path, now) for source, native_id, url, path in postings],
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_term_stats() -> Dict[str, Dict[str, Any]]:
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM search_term_stats")
+    rows = cur.fetchall()
+    conn.close()
+    return {row["term"]: dict(row) for row in rows}
+
+
+def record_term_stats(
+    term: str,
+    requests: int,
+    found: int,
+    new: int,
+    high_score: int,
+    parent: Optional[str] = None,
+    complete: bool = True,
+) -> None:
+    """
+    Add one run's counts to a search term's running totals. stale_runs counts
+    consecutive complete runs with nothing new; an incomplete run (cancelled,
+    throttled, failed) leaves it unchanged.
+    """
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO search_term_stats (term, parent, runs, requests, found, new, high_score, stale_runs, last_run)
+        VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(term) DO UPDATE SET
+            runs=search_term_stats.runs + 1,
+            requests=search_term_stats.requests + excluded.requests,
+            found=search_term_stats.found + excluded.found,
+            new=search_term_stats.new + excluded.new,
+            high_score=search_term_stats.high_score + excluded.high_score,
+            stale_runs=CASE WHEN excluded.new > 0 THEN 0 ELSE search_term_stats.stale_runs + excluded.stale_runs END,
+            last_run=excluded.last_run;
+        """,
+        (term, parent, requests, found, new, high_score, 0 if new or not complete else 1, _now()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def set_term_retired(term: str, retired: bool = True) -> None:
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("UPDATE search_term_stats SET retired = ? WHERE term = ?", (int(retired), term))
+    conn.commit()
+    conn.close()
+
+
+def seen_alert_ids(entry_ids: Iterable[str]) -> Set[str]:
+    """The subset of entry_ids already in alert_seen."""
+    ids = list(dict.fromkeys(entry_ids))
+    if not ids:
+        return set()
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    found: Set[str] = set()
+    for start in range(0, len(ids), _LOOKUP_CHUNK):
+        chunk = ids[start:start + _LOOKUP_CHUNK]
+        cur.execute(
+            f"SELECT entry_id FROM alert_seen WHERE entry_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        found.update(row["entry_id"] for row in cur.fetchall())
+    conn.close()
+    return found
+
+
+def record_alert_seen(entries: Iterable[Tuple[str, Optional[str]]]) -> None:
+    """Mark (entry_id, feed_url) pairs as seen now; existing entries keep their first_seen."""
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    now = _now()
+    cur.executemany(
+        """
+        INSERT INTO alert_seen (entry_id, feed, first_seen, last_seen)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(entry_id) DO UPDATE SET
+            feed=COALESCE(excluded.feed, alert_seen.feed),
+            last_seen=excluded.last_seen;
+        """,
+        [(entry_id, feed, now, now) for entry_id, feed in entries],
+    )
+    conn.commit()
+    conn.close()
+
+
+def evict_alert_seen(max_age_days: float) -> int:
+    """Forget entries no feed has listed for max_age_days; returns how many were removed."""
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
+    cur.execute("DELETE FROM alert_seen WHERE last_seen < ?", (cutoff,))
+    removed = cur.rowcount
+    conn.commit()
+    conn.close()
+    return removed
+
+
+def load_ingest_manifest(paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """path -> manifest row (size, mtime_ns, hashes, job_id, …) for the paths ingested before."""
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    rows: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(paths), _LOOKUP_CHUNK):
+        chunk = paths[start:start + _LOOKUP_CHUNK]
+        cur.execute(f"SELECT * FROM ingest_manifest WHERE path IN ({','.join('?' * len(chunk))})", chunk)
+        rows.update((row["path"], dict(row)) for row in cur.fetchall())
+    conn.close()
+    return rows
+
+
+def record_ingest_manifest(entries: Iterable[Dict[str, Any]]) -> None:
+    """Upsert manifest rows (path, bucket, size, mtime_ns, content_hash, body_hash, job_id, fingerprint_source)."""
+    now = _now()
+    rows = [
+        (
+            e["path"], e.get("bucket"), e.get("size"), e.get("mtime_ns"), e.get("content_hash"),
+            e.get("body_hash"), e.get("job_id"), e.get("fingerprint_source"), now,
+        )
+        for e in entries
+    ]
+    if not rows:
+        return
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        INSERT OR REPLACE INTO ingest_manifest
+            (path, bucket, size, mtime_ns, content_hash, body_hash, job_id, fingerprint_source, ingested_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def has_job_keys() -> bool:
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM job_keys LIMIT 1")
+    row = cur.fetchone()
+    conn.close()
+    return row is not None
+
+
+def resolve_job_keys(keys: Iterable[str]) -> Dict[str, str]:
+    """identity key -> owning job_id for the keys that are already indexed."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    owners: Dict[str, str] = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[start:start + _LOOKUP_CHUNK]
+        cur.execute(f"SELECT key, job_id FROM job_keys WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+        owners.update((row["key"], row["job_id"]) for row in cur.fetchall())
+    conn.close()
+    return owners
+
+
+def list_job_keys(job_ids: Iterable[str]) -> Dict[str, List[str]]:
+    """job_id -> the identity keys it owns, for the given jobs."""
+    job_ids = list(dict.fromkeys(job_ids))
+    if not job_ids:
+        return {}
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    keys: Dict[str, List[str]] = {}
+    for start in range(0, len(job_ids), _LOOKUP_CHUNK):
+        chunk = job_ids[start:start + _LOOKUP_CHUNK]
+        cur.execute(f"SELECT key, job_id FROM job_keys WHERE job_id IN ({','.join('?' * len(chunk))})", chunk)
+        for row in cur.fetchall():
+            keys.setdefault(row["job_id"], []).append(row["key"])
+    conn.close()
+    return keys
+
+
+def record_job_keys(pairs: Iterable[Tuple[str, str]]) -> None:
+    """Index (key, job_id) pairs; a key that already has an owner keeps it."""
+    rows = [(key, job_id, _now()) for key, job_id in pairs]
+    if not rows:
+        return
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.executemany("INSERT OR IGNORE INTO job_keys (key, job_id, created_at) VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def link_job_duplicates(links: Iterable[Tuple[str, str, str, Optional[str]]]) -> None:
+    """Record (duplicate_id, canonical_id, source, url) links for postings skipped as repeats."""
+    rows = [(dup, canonical, source, url, _now()) for dup, canonical, source, url in links]
+    if not rows:
+        return
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.executemany(
+        """
+        INSERT INTO job_duplicates (duplicate_id, canonical_id, source, url, linked_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(duplicate_id) DO UPDATE SET
+            canonical_id=excluded.canonical_id,
+            source=excluded.source,
+            url=COALESCE(excluded.url, job_duplicates.url),
+            linked_at=excluded.linked_at;
+        """,
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_job_duplicates(canonical_id: str) -> List[Dict[str, Any]]:
+    """Other sightings of a job that were linked to it instead of being stored again."""
+    init_db()
+    conn = _connect()
+    cur = conn.cursor()
+    cur.execute("SELECT * FROM job_duplicates WHERE canonical_id = ? ORDER BY linked_at", (canonical_id,))
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
 def _row_to_job(row: sqlite3.Row) -> JobRecord:
     skills = []
     if row["skills"]:
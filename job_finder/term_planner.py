@@ -0,0 +1,146 @@
+"""
+Search-term planning by historical yield.
+
+Every scrape records, per term, how many requests it cost and how many new
+and high-scoring jobs it produced (search_term_stats in jobs.db). plan_search_terms
+spends a request budget on the terms with the best yield per request, with an
+exploration bonus so untried terms get a run. It also tries narrower variants of
+terms that keep producing strong matches and retires terms that repeatedly
+produce nothing new. Only complete, unthrottled runs count toward retirement,
+and a retired term gets another run once RETRY_RETIRED_AFTER has passed.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from .scraper import DEFAULT_MAX_TERMS, TermYield, extract_search_terms, term_request_cost
+from .storage import list_term_stats, record_term_stats, set_term_retired
+
+# Score at or above which a scraped job counts as a strong match for its term.
+HIGH_SCORE = 0.35
+DEFAULT_REQUEST_BUDGET = 120
+# Candidate pool drawn from liked fingerprints before ranking.
+MAX_BASE_TERMS = 12
+# Terms that produce nothing new this many complete runs in a row are retired.
+RETIRE_AFTER_RUNS = 3
+# A retired term is tried again this long after its last run; new jobs un-retire it.
+RETRY_RETIRED_AFTER = timedelta(days=14)
+# How many promising terms get narrower variants, and how many variants each.
+EXPAND_TOP = 2
+EXPANSIONS_PER_TERM = 2
+# Weight of the exploration bonus against observed yield.
+EXPLORATION = 0.3
+
+
+@dataclass
+class SearchPlan:
+    terms: List[str]
+    parents: Dict[str, str] = field(default_factory=dict)
+    estimated_requests: int = 0
+
+
+def _is_retired(row: Optional[Dict], now: datetime) -> bool:
+    """Retired and not yet due for another try."""
+    if not row or not row["retired"]:
+        return False
+    try:
+        last_run = datetime.fromisoformat(row["last_run"])
+    except (TypeError, ValueError):
+        return False
+    return now - last_run < RETRY_RETIRED_AFTER
+
+
+def _yield_rate(row: Dict) -> float:
+    return (row["new"] + 2 * row["high_score"]) / max(row["requests"], 1)
+
+
+def _expansions(term: str, fingerprints: List[Dict]) -> List[str]:
+    """Narrower variants of term: term + a skill the liked jobs share, most common first."""
+    counts: Dict[str, int] = {}
+    for fp in fingerprints:
+        for skill in fp.get("skills") or []:
+            skill = str(skill).strip().lower()
+            if skill and skill not in term.lower():
+                counts[skill] = counts.get(skill, 0) + 1
+    ranked = sorted(counts, key=lambda s: (-counts[s], s))
+    return [f"{term} {skill}" for skill in ranked[:EXPANSIONS_PER_TERM]]
+
+
+def plan_search_terms(
+    fingerprints: List[Dict],
+    request_budget: int = DEFAULT_REQUEST_BUDGET,
+    results_per_term: int = 15,
+    sources: Optional[Iterable[str]] = None,
+) -> SearchPlan:
+    """
+    Choose and order search terms for one scrape within request_budget,
+    costing each term across every enabled source (see iter_similar_jobs).
+
+    Terms are ranked by (new + 2 × high-scoring jobs) per request plus an
+    upper-confidence bonus that shrinks as a term accumulates runs.
+    """
+    stats = list_term_stats()
+    now = datetime.utcnow()
+    candidates: Dict[str, Optional[str]] = {
+        term: None for term in extract_search_terms(fingerprints, max_terms=MAX_BASE_TERMS)
+    }
+
+    promising = sorted(
+        (row for row in stats.values() if row["high_score"] and not row["retired"]),
+        key=_yield_rate,
+        reverse=True,
+    )[:EXPAND_TOP]
+    for row in promising:
+        candidates.setdefault(row["term"], row["parent"])
+        for variant in _expansions(row["term"], fingerprints):
+            candidates.setdefault(variant, row["term"])
+
+    total_runs = sum(row["runs"] for row in stats.values())
+    mean_rate = (
+        sum(_yield_rate(row) for row in stats.values()) / len(stats) if stats else 1.0
+    )
+
+    def priority(term: str) -> float:
+        row = stats.get(term)
+        if row is None:
+            # Untried: assume average yield and give it the full exploration bonus.
+            return mean_rate + EXPLORATION * math.sqrt(math.log(total_runs + 2))
+        return _yield_rate(row) + EXPLORATION * math.sqrt(math.log(total_runs + 2) / (row["runs"] + 1))
+
+    ranked = sorted(
+        (term for term in candidates if not _is_retired(stats.get(term), now)),
+        key=priority,
+        reverse=True,
+    )
+
+    cost = term_request_cost(results_per_term, sources)
+    count = max(1, request_budget // max(cost, 1))
+    # Never plan an empty scrape: with every candidate retired, search the base terms.
+    terms = ranked[:count] or extract_search_terms(fingerprints, max_terms=min(count, DEFAULT_MAX_TERMS))
+    return SearchPlan(
+        terms=terms,
+        parents={term: parent for term, parent in candidates.items() if term in terms and parent},
+        estimated_requests=cost * len(terms),
+    )
+
+
+def record_term_yields(yields: Dict[str, TermYield], parents: Optional[Dict[str, str]] = None) -> None:
+    """Fold a scrape's per-term yields into search_term_stats, retire dead terms and revive retried ones."""
+    parents = parents or {}
+    for term, y in yields.items():
+        record_term_stats(
+            term, y.requests, y.found, y.new, y.high_score,
+            parent=parents.get(term), complete=y.complete and not y.throttled,
+        )
+    stats = list_term_stats()
+    for term in yields:
+        row = stats.get(term)
+        if not row:
+            continue
+        if row["stale_runs"] >= RETIRE_AFTER_RUNS and not row["retired"]:
+            set_term_retired(term)
+        elif row["stale_runs"] == 0 and row["retired"]:
+            set_term_retired(term, False)
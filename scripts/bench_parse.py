@@ -0,0 +1,133 @@
+"""
+Benchmark scraper HTML parsing: the original full-tree html.parser path
+against parse_search_cards / parse_description (lxml + strainers when available).
+
+    python -m scripts.bench_parse                    # synthetic pages
+    python -m scripts.bench_parse --fixtures DIR     # saved search*.html / detail*.html pages
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from job_finder.identity import extract_job_id_from_href
+from job_finder.scraper import HTML_PARSER, parse_description, parse_search_cards
+
+
+def _legacy_search(html: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for card in soup.select("li"):
+        a_tag = card.select_one("a.base-card__full-link") or card.select_one("a[href*='/jobs/view/']")
+        if not a_tag:
+            continue
+        job_id = extract_job_id_from_href(a_tag.get("href", ""))
+        if not job_id:
+            continue
+        title_el = card.select_one("h3.base-search-card__title") or card.select_one("h3")
+        company_el = card.select_one("h4.base-search-card__subtitle") or card.select_one("h4")
+        loc_el = card.select_one("span.job-search-card__location")
+        jobs.append({
+            "job_id": job_id,
+            "title": title_el.get_text(strip=True) if title_el else "Unknown Role",
+            "company": company_el.get_text(strip=True) if company_el else "Unknown Company",
+            "location": loc_el.get_text(strip=True) if loc_el else "",
+        })
+    return jobs
+
+
+def _legacy_description(html: str) -> Optional[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    desc_el = (
+        soup.select_one("div.show-more-less-html__markup")
+        or soup.select_one("div.description__text")
+        or soup.select_one("section.description")
+    )
+    if desc_el:
+        text = desc_el.get_text(separator="\n", strip=True)
+        return text if len(text) > 80 else None
+    return None
+
+
+def _page_chrome(body: str) -> str:
+    """Wrap content in the kind of head/nav/script noise real pages carry."""
+    scripts = "".join(f"<script>var x{i} = {{'k': {i}}};</script>" for i in range(40))
+    nav = "".join(f'<li class="nav-item"><a href="/nav/{i}">Nav {i}</a></li>' for i in range(30))
+    return (
+        f"<html><head><title>Jobs</title>{scripts}</head><body>"
+        f'<header><ul class="nav">{nav}</ul></header><main>{body}</main>'
+        f'<footer>{"<p>Footer text</p>" * 50}</footer></body></html>'
+    )
+
+
+def synthetic_search_page(n: int = 25) -> str:
+    cards = "".join(
+        f'<li><div class="base-card"><a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/role-{3900000000 + i}?trk=x"></a>'
+        f'<div class="base-search-card__info"><h3 class="base-search-card__title">Data Engineer {i}</h3>'
+        f'<h4 class="base-search-card__subtitle"><a href="/company/{i}">Company {i}</a></h4>'
+        f'<div class="base-search-card__metadata"><span class="job-search-card__location">Remote</span>'
+        f'<time datetime="2024-01-01">1 day ago</time></div></div></div></li>'
+        for i in range(n)
+    )
+    return _page_chrome(f'<ul class="jobs-search__results-list">{cards}</ul>')
+
+
+def synthetic_detail_page() -> str:
+    paragraphs = "".join(f"<p>Responsibility {i}: build and maintain data pipelines with Python and SQL.</p>" for i in range(30))
+    bullets = "".join(f"<li>Requirement {i}</li>" for i in range(20))
+    related = "".join(f'<li class="similar-job"><a href="/jobs/view/{i}">Similar {i}</a></li>' for i in range(40))
+    return _page_chrome(
+        f'<section class="top-card"><h2>Data Engineer</h2></section>'
+        f'<section class="description"><div class="description__text">'
+        f'<div class="show-more-less-html__markup">{paragraphs}<ul>{bullets}</ul></div></div></section>'
+        f'<section class="similar-jobs"><ul>{related}</ul></section>'
+    )
+
+
+def _time(func: Callable[[str], object], pages: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    return (time.perf_counter() - start) / (repeat * max(len(pages), 1)) * 1000
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fixtures", type=Path, help="directory with saved search*.html and detail*.html pages")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.fixtures:
+        search_pages = [p.read_text(encoding="utf-8") for p in sorted(args.fixtures.glob("search*.html"))]
+        detail_pages = [p.read_text(encoding="utf-8") for p in sorted(args.fixtures.glob("detail*.html"))]
+    else:
+        search_pages = [synthetic_search_page()]
+        detail_pages = [synthetic_detail_page()]
+
+    # Both paths must agree before their timings mean anything.
+    for page in search_pages:
+        assert [j["job_id"] for j in _legacy_search(page)] == [j["job_id"] for j in parse_search_cards(page)]
+    for page in detail_pages:
+        assert _legacy_description(page) == parse_description(page)
+
+    print(f"parser backend: {HTML_PARSER}")
+    for label, pages, legacy, new in (
+        ("search", search_pages, _legacy_search, parse_search_cards),
+        ("detail", detail_pages, _legacy_description, parse_description),
+    ):
+        if not pages:
+            continue
+        before = _time(legacy, pages, args.repeat)
+        after = _time(new, pages, args.repeat)
+        print(f"{label:7s} {len(pages):3d} page(s)  html.parser {before:7.2f} ms  new {after:7.2f} ms  x{before / after:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
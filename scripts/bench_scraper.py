@@ -0,0 +1,102 @@
+"""
+Drive scrape_similar_jobs against a local stub server and report throughput
+and back-off behaviour — no LinkedIn traffic.
+
+    python -m scripts.bench_scraper                              # synthetic fixtures
+    python -m scripts.bench_scraper --fixtures DIR --latency 0.2 --burst-every 40 --burst-len 5
+    python -m scripts.bench_scraper --record DIR --term "data engineer"   # capture real pages
+
+Fixtures are recorded by any real scrape run with JOB_FINDER_SCRAPER_RECORD=DIR;
+--record is a shortcut for that.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from job_finder import scraper
+from job_finder.scrape_fixtures import RECORD_ENV, StubServer, synthesize_fixtures
+
+
+def _record(args: argparse.Namespace) -> int:
+    os.environ[RECORD_ENV] = str(args.record)
+    jobs = scraper.scrape_similar_jobs(
+        [{"role_title": term} for term in args.term],
+        results_per_term=args.results,
+        use_cache=False,
+        skip_known=False,
+        sources=["linkedin", "indeed"],
+    )
+    print(f"recorded {len(jobs)} job(s) into {args.record}")
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    workdir = Path(tempfile.mkdtemp(prefix="bench-scraper-"))
+    fixtures = args.fixtures or synthesize_fixtures(workdir / "fixtures", keywords=args.term[0])
+    # Fresh workspace so the HTTP cache, known postings and saved cookies don't skew the run.
+    os.environ["JOB_FINDER_DATA_ROOT"] = str(workdir)
+
+    with StubServer(
+        fixtures,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_len=args.burst_len,
+        retry_after=args.retry_after,
+    ) as stub:
+        os.environ[scraper.LINKEDIN_BASE_ENV] = stub.base_url
+        os.environ[scraper.INDEED_BASE_ENV] = stub.base_url
+        start = time.perf_counter()
+        jobs = scraper.scrape_similar_jobs(
+            [{"role_title": term} for term in args.term],
+            results_per_term=args.results,
+            delay=args.delay,
+            workers=args.workers,
+            use_cache=False,
+            skip_known=False,
+            sources=["linkedin"],
+        )
+        elapsed = time.perf_counter() - start
+        stats = stub.stats
+
+    stamps = stats.timestamps
+    peak = 0
+    for i, t in enumerate(stamps):
+        peak = max(peak, sum(1 for u in stamps[i:] if u - t < 1.0))
+    print(f"jobs              {len(jobs)}")
+    print(f"wall time         {elapsed:.2f} s")
+    print(f"jobs/s            {len(jobs) / elapsed:.1f}")
+    print(f"requests          {stats.requests}  ({', '.join(f'{k} {v}' for k, v in sorted(stats.by_kind.items()))})")
+    print(f"429s / 500s       {stats.throttled} / {stats.errors}")
+    print(f"peak requests/s   {peak}")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fixtures", type=Path, help="fixture directory (default: synthesize one)")
+    ap.add_argument("--record", type=Path, help="scrape the real sites and save fixtures here")
+    ap.add_argument("--term", action="append", help="search term (repeatable)")
+    ap.add_argument("--results", type=int, default=100, help="results per term")
+    ap.add_argument("--workers", type=int, default=scraper.DEFAULT_WORKERS)
+    ap.add_argument("--delay", type=float, default=0.25, help="initial seconds between requests per host")
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--burst-every", type=int, default=0, help="serve a 429 burst after this many requests")
+    ap.add_argument("--burst-len", type=int, default=0)
+    ap.add_argument("--retry-after", type=float, default=1.0)
+    args = ap.parse_args()
+    args.term = args.term or ["data engineer"]
+
+    if args.record:
+        return _record(args)
+    return _bench(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,92 @@
+"""
+Poll the alert feeds configured in the profile.
+
+    python -m scripts.run_alerts                 # one pass over every feed (scheduled task)
+    python -m scripts.run_alerts --daemon        # keep running, each feed on its own interval
+"""
 from __future__ import annotations
 
+import argparse
+import signal
 import sys
+from typing import List, Optional
 
-from job_finder.alerts import build_alert_email, run_alerts, send_resend_email
-from job_finder.env import ensure_resend_key, get_resend_from
+from job_finder.alert_daemon import DEFAULT_EMAIL_WINDOW, AlertDaemon
+from job_finder.alerts import AlertMatch, build_alert_email, run_alerts, send_resend_email
+from job_finder.claude import AsyncClaudeClient
+from job_finder.env import ensure_anthropic_key, ensure_resend_key, get_resend_from
 from job_finder.profile import load_profile
 
 
-def main() -> int:
+def _claude_client(use_claude: bool) -> Optional[AsyncClaudeClient]:
+    """Fingerprint alerts with Claude when a key is configured; otherwise the local extractor is used."""
+    if not use_claude:
+        return None
+    key, _ = ensure_anthropic_key()
+    return AsyncClaudeClient(key) if key else None
+
+
+def send_alert_email(matches: List[AlertMatch]) -> None:
+    profile = load_profile()
+    if not (matches and profile.alert_email_enabled and profile.alert_email_to):
+        return
+    resend_key, _ = ensure_resend_key()
+    if resend_key:
+        html = build_alert_email(matches)
+        send_resend_email(
+            resend_key,
+            profile.alert_email_to,
+            "Job Finder Alerts",
+            html,
+            from_email=get_resend_from(),
+        )
+
+
+def run_once(use_claude: bool) -> int:
     profile = load_profile()
-    new_files = run_alerts(profile)
-
-    if new_files and profile.alert_email_enabled and profile.alert_email_to:
-        resend_key, _ = ensure_resend_key()
-        if resend_key:
-            html = build_alert_email(new_files)
-            send_resend_email(
-                resend_key,
-                profile.alert_email_to,
-                "Job Finder Alerts",
-                html,
-                from_email=get_resend_from(),
-            )
+    result = run_alerts(profile, client=_claude_client(use_claude))
+    for url, error in result.failures.items():
+        print(f"alert feed failed: {url}: {error}", file=sys.stderr)
+    if result.fingerprint_error:
+        print(f"claude fingerprinting failed, used local fingerprints: {result.fingerprint_error}", file=sys.stderr)
 
+    send_alert_email(result.matches)
+
+    # Only a run where every feed failed counts as a failed run.
+    return 1 if result.failures and len(result.failures) == len(set(profile.alert_sources)) else 0
+
+
+def run_daemon(email_window: float, use_claude: bool) -> int:
+    daemon = AlertDaemon(
+        notify=send_alert_email,
+        email_window=email_window,
+        log=lambda msg: print(msg, flush=True),
+        client=_claude_client(use_claude),
+    )
+    # SIGTERM is how Procfile hosts stop a worker; finish the current poll and send what's pending.
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        pass  # run_forever already sent the pending batch
     return 0
 
 
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--daemon", action="store_true", help="keep polling on per-feed schedules")
+    ap.add_argument(
+        "--email-window",
+        type=float,
+        default=DEFAULT_EMAIL_WINDOW / 60,
+        help="daemon: minutes to collect new alerts into one email (default: %(default)s)",
+    )
+    ap.add_argument("--local", action="store_true", help="fingerprint alerts locally even if a Claude key is set")
+    args = ap.parse_args()
+    if args.daemon:
+        return run_daemon(args.email_window * 60, use_claude=not args.local)
+    return run_once(use_claude=not args.local)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())